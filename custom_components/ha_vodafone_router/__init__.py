@@ -1,10 +1,17 @@
+from __future__ import annotations
+
+import asyncio
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.const import Platform
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 import logging
 
 from .const import (
+    DEFAULT_MIN_REFRESH_AGE,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     ENTRY_DATA_HOST,
@@ -12,13 +19,44 @@ from .const import (
     OPTION_SCAN_INTERVAL,
     OPTION_USERNAME,
     OPTION_MAC_FILTER,
+    OPTION_MIN_REFRESH_AGE,
     OPTION_ENABLE_BINARY_SENSOR,
     OPTION_ENABLE_DEVICE_TRACKER,
+    OPTION_ENABLE_SENSOR,
+    OPTION_MAC_GROUPS,
+)
+from .coordinator import (
+    VodafoneDeviceView,
+    async_acquire_coordinator,
+    async_release_coordinator,
 )
-from .coordinator import VodafoneDeviceCoordinator
+from .vodafone_box import TransportOptions
+from .services import async_setup_services
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Vodafone Station services."""
+    async_setup_services(hass)
+    async_register_websocket_commands(hass)
+    return True
+
+
+def _get_platforms(entry: ConfigEntry) -> list[Platform]:
+    """Determine which platforms to load based on user configuration."""
+    platforms = []
+    if entry.options.get(OPTION_ENABLE_BINARY_SENSOR, True):
+        platforms.append(Platform.BINARY_SENSOR)
+    if entry.options.get(OPTION_ENABLE_DEVICE_TRACKER, True):
+        platforms.append(Platform.DEVICE_TRACKER)
+    if entry.options.get(OPTION_ENABLE_SENSOR, True):
+        platforms.append(Platform.SENSOR)
+    return platforms
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Vodafone Station integration from a config entry."""
@@ -31,26 +69,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     password = entry.options.get(OPTION_PASSWORD)
     scan_interval = entry.options.get(OPTION_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
     mac_filter = entry.options.get(OPTION_MAC_FILTER, "")
-    enable_binary_sensor = entry.options.get(OPTION_ENABLE_BINARY_SENSOR, True)
-    enable_device_tracker = entry.options.get(OPTION_ENABLE_DEVICE_TRACKER, True)
+    min_refresh_age = entry.options.get(OPTION_MIN_REFRESH_AGE, DEFAULT_MIN_REFRESH_AGE)
+    platforms = _get_platforms(entry)
 
     _LOGGER.debug(
-        "Configuration: host=%s, username=%s, scan_interval=%s, mac_filter=%s, platforms=bs:%s dt:%s",
+        "Configuration: host=%s, username=%s, scan_interval=%s, mac_filter=%s, platforms=%s",
         host,
         username,
         scan_interval,
         mac_filter,
-        enable_binary_sensor,
-        enable_device_tracker,
+        [p.value for p in platforms],
     )
 
-    # Determine which platforms to load based on user configuration
-    platforms = []
-    if enable_binary_sensor:
-        platforms.append(Platform.BINARY_SENSOR)
-    if enable_device_tracker:
-        platforms.append(Platform.DEVICE_TRACKER)
-
     if not platforms:
         _LOGGER.error("No platforms enabled - at least one platform must be selected")
         raise ConfigEntryNotReady(
@@ -59,58 +89,62 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     _LOGGER.info("Enabled platforms: %s", [p.value for p in platforms])
 
-    coordinator = VodafoneDeviceCoordinator(
-        hass,
-        host=host,
-        username=username,
-        password=password,
-        scan_interval=scan_interval,
-        mac_filter=mac_filter,
-    )
-
     try:
-        _LOGGER.debug("Attempting initial login and data refresh")
-        await coordinator.async_login()
-        await coordinator.async_config_entry_first_refresh()
+        coordinator = await async_acquire_coordinator(
+            hass,
+            entry.entry_id,
+            host=host,
+            username=username,
+            password=password,
+            scan_interval=scan_interval,
+            transport=TransportOptions.from_options(entry.options),
+        )
         _LOGGER.info("Initial connection and data refresh successful")
     except Exception as err:
         _LOGGER.error("Failed to connect to Vodafone Station: %s", err, exc_info=True)
         raise ConfigEntryNotReady(f"Cannot connect to Vodafone Station: {err}") from err
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    view = VodafoneDeviceView(
+        coordinator,
+        mac_filter,
+        min_refresh_age,
+        entry.options.get(OPTION_MAC_GROUPS, ""),
+    )
+    view.platforms = platforms
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = view
     _LOGGER.debug("Setting up platforms: %s", [p.value for p in platforms])
     await hass.config_entries.async_forward_entry_setups(entry, platforms)
 
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
     _LOGGER.info("Vodafone Station integration setup completed successfully")
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Unload a config entry and logout from the Vodafone Station."""
-    _LOGGER.info("Unloading Vodafone Station integration for entry: %s", entry.entry_id)
-
-    coordinator: VodafoneDeviceCoordinator = hass.data[DOMAIN][entry.entry_id]
-
-    try:
-        _LOGGER.debug("Attempting to logout from Vodafone Station")
-        await coordinator.async_logout()
-        _LOGGER.info("Successfully logged out from Vodafone Station")
-    except Exception as err:
-        _LOGGER.warning("Failed to logout from Vodafone Station: %s", err)
-
-    # Determine which platforms were loaded
-    enable_binary_sensor = entry.options.get(OPTION_ENABLE_BINARY_SENSOR, True)
-    enable_device_tracker = entry.options.get(OPTION_ENABLE_DEVICE_TRACKER, True)
+    """Unload a config entry and logout from the Vodafone Station.
 
-    platforms = []
-    if enable_binary_sensor:
-        platforms.append(Platform.BINARY_SENSOR)
-    if enable_device_tracker:
-        platforms.append(Platform.DEVICE_TRACKER)
+    The router session is shared per host, so the logout only happens once the
+    last entry for that host is unloaded.
+    """
+    _LOGGER.info("Unloading Vodafone Station integration for entry: %s", entry.entry_id)
 
-    # Unload platforms
+    # Options may have changed since setup, so use what is actually loaded
+    view: VodafoneDeviceView = hass.data[DOMAIN][entry.entry_id]
+    platforms = view.platforms
+    for platform in platforms:
+        view.async_remove_platform_listener(platform)
+    # The host coordinator may live on for other entries, so end this entry's
+    # websocket subscriptions explicitly.
+    view.async_end_subscriptions()
+
+    # Platforms and the router session are torn down concurrently, so a dead
+    # router only costs the bounded logout and not a full request timeout.
     _LOGGER.debug("Unloading platforms: %s", [p.value for p in platforms])
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
+    unload_ok, _ = await asyncio.gather(
+        hass.config_entries.async_unload_platforms(entry, platforms),
+        async_release_coordinator(hass, entry.entry_id, entry.data[ENTRY_DATA_HOST]),
+    )
 
     if unload_ok:
         _LOGGER.debug("Platforms unloaded successfully")
@@ -122,3 +156,63 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     _LOGGER.info("Vodafone Station integration unloaded")
 
     return unload_ok
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options in place, keeping the router session alive."""
+    _LOGGER.info("Applying updated options for entry: %s", entry.entry_id)
+
+    view: VodafoneDeviceView = hass.data[DOMAIN][entry.entry_id]
+    coordinator = view.coordinator
+
+    # New credentials are used on the next re-login, the current session stays
+    coordinator.username = entry.options.get(OPTION_USERNAME)
+    coordinator.password = entry.options.get(OPTION_PASSWORD)
+    coordinator.attach_entry(
+        entry.entry_id,
+        entry.options.get(OPTION_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+    )
+    transport = TransportOptions.from_options(entry.options)
+    if transport != coordinator.box.transport:
+        try:
+            await coordinator.async_set_transport(transport)
+        except Exception as err:
+            _LOGGER.error(
+                "Keeping the current connection, login with %s failed: %s",
+                transport,
+                err,
+            )
+    previous_groups = view.mac_groups
+    view.update_options(
+        entry.options.get(OPTION_MAC_FILTER, ""),
+        entry.options.get(OPTION_MIN_REFRESH_AGE, DEFAULT_MIN_REFRESH_AGE),
+        entry.options.get(OPTION_MAC_GROUPS, ""),
+    )
+
+    platforms = _get_platforms(entry)
+    removed = [p for p in view.platforms if p not in platforms]
+    added = [p for p in platforms if p not in view.platforms]
+    if (
+        view.mac_groups != previous_groups
+        and Platform.SENSOR in view.platforms
+        and Platform.SENSOR in platforms
+    ):
+        # Group sensors are created at setup, so recreate only that platform
+        removed.append(Platform.SENSOR)
+        added.append(Platform.SENSOR)
+
+    async with entry.setup_lock:
+        if removed:
+            _LOGGER.debug("Unloading platforms: %s", [p.value for p in removed])
+            for platform in removed:
+                view.async_remove_platform_listener(platform)
+            await hass.config_entries.async_unload_platforms(entry, removed)
+
+        view.platforms = platforms
+
+        if added:
+            _LOGGER.debug("Setting up platforms: %s", [p.value for p in added])
+            await hass.config_entries.async_forward_entry_setups(entry, added)
+
+    # Let entities and platforms react to the new filter without polling
+    coordinator.async_update_listeners()
@@ -3,7 +3,8 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from voluptuous import Any
 from .const import (
@@ -14,7 +15,7 @@ from .const import (
     ROUTER_PROPERTY_LAN_DEVICES,
     ROUTER_PROPERTY_WLAN_DEVICES,
 )
-from .coordinator import VodafoneDeviceCoordinator
+from .coordinator import VodafoneDeviceView
 import logging
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,29 +29,16 @@ async def async_setup_entry(
         "Setting up Vodafone binary sensor entities for entry: %s", entry.entry_id
     )
 
-    coordinator: VodafoneDeviceCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator: VodafoneDeviceView = hass.data[DOMAIN][entry.entry_id]
 
     # Coordinator is already logged in and has data from __init__.py
     _LOGGER.debug("Using coordinator data for binary sensor setup (already logged in)")
 
-    _LOGGER.debug("Creating binary sensor entities from connected devices")
-    sensors = []
-    total_devices = 0
-
-    for dev_list_name in [ROUTER_PROPERTY_LAN_DEVICES, ROUTER_PROPERTY_WLAN_DEVICES]:
-        devices = coordinator.data.get(dev_list_name, [])
-        _LOGGER.debug(
-            "Processing %s devices from %s for binary sensors",
-            len(devices),
-            dev_list_name,
-        )
-
-        for device in devices:
-            total_devices += 1
-            if not device.get(DEVICE_PROPERTY_MAC_ADDRESS):
-                _LOGGER.warning("Skipping device without MAC address: %s", device)
-                continue
-
+    @callback
+    def _async_add_new_devices() -> None:
+        """Create entities for devices that do not have one yet."""
+        sensors = []
+        for device in coordinator.untracked_devices(Platform.BINARY_SENSOR):
             _LOGGER.debug(
                 "Creating binary sensor for device: %s (%s)",
                 device.get(DEVICE_PROPERTY_HOSTNAME, "Unknown"),
@@ -58,20 +46,24 @@ async def async_setup_entry(
             )
             sensors.append(VodafoneDeviceBinarySensor(coordinator, device))
 
-    _LOGGER.info(
-        "Created %s binary sensor entities from %s total devices",
-        len(sensors),
-        total_devices,
+        if sensors:
+            _LOGGER.info("Created %s binary sensor entities", len(sensors))
+            async_add_entities(sensors)
+
+    _async_add_new_devices()
+    # Picks up devices newly included by a changed MAC filter
+    coordinator.async_add_platform_listener(
+        Platform.BINARY_SENSOR, _async_add_new_devices
     )
-    async_add_entities(sensors)
 
 
 class VodafoneDeviceBinarySensor(BinarySensorEntity):
     """Binary sensor representing a Vodafone Station connected device."""
 
+    _attr_should_poll = False
     _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
 
-    def __init__(self, coordinator: VodafoneDeviceCoordinator, device: dict[str, Any]):
+    def __init__(self, coordinator: VodafoneDeviceView, device: dict[str, Any]):
         self.coordinator = coordinator
         self.device = device
         self.mac = device.get(DEVICE_PROPERTY_MAC_ADDRESS)
@@ -113,16 +105,28 @@ class VodafoneDeviceBinarySensor(BinarySensorEntity):
         )
         return is_connected
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return connection history of the device and staleness of the data."""
+        return self.coordinator.device_attributes(self.mac)
+
     async def async_update(self) -> None:
         await self.coordinator.async_request_refresh()
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if not self.coordinator.includes(self.mac):
+            self.coordinator.async_remove_entity(Platform.BINARY_SENSOR, self)
+            return
+        self.async_write_ha_state()
+
     async def async_added_to_hass(self) -> None:
         """Register for coordinator updates."""
         _LOGGER.debug(
             "Adding binary sensor %s (%s) to Home Assistant", self._attr_name, self.mac
         )
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
         )
         _LOGGER.debug(
             "Registered binary sensor %s for coordinator updates", self._attr_name
@@ -9,14 +9,29 @@ from .const import (
     OPTION_MAC_FILTER,
     OPTION_ENABLE_BINARY_SENSOR,
     OPTION_ENABLE_DEVICE_TRACKER,
+    OPTION_ENABLE_SENSOR,
+    OPTION_MAC_GROUPS,
     OPTION_SCAN_INTERVAL,
+    OPTION_MIN_REFRESH_AGE,
+    OPTION_USE_HTTPS,
+    OPTION_VERIFY_SSL,
+    OPTION_CERT_FINGERPRINT,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_MIN_REFRESH_AGE,
 )
-from .vodafone_box import VodafoneBox
+from .vodafone_box import TransportOptions, VodafoneBox
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class NoPlatformsSelected(Exception):
+    """Raised when no entity platform is enabled."""
+
+
+class FingerprintWithoutHttps(Exception):
+    """Raised when a certificate fingerprint is given but HTTPS is off."""
+
+
 class VodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Vodafone Station."""
 
@@ -40,7 +55,15 @@ class VodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             mac_filter = user_input.get(OPTION_MAC_FILTER, "")
             enable_binary_sensor = user_input.get(OPTION_ENABLE_BINARY_SENSOR, True)
             enable_device_tracker = user_input.get(OPTION_ENABLE_DEVICE_TRACKER, True)
+            enable_sensor = user_input.get(OPTION_ENABLE_SENSOR, True)
+            mac_groups = user_input.get(OPTION_MAC_GROUPS, "")
             scan_interval = user_input.get(OPTION_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+            min_refresh_age = user_input.get(
+                OPTION_MIN_REFRESH_AGE, DEFAULT_MIN_REFRESH_AGE
+            )
+            use_https = user_input.get(OPTION_USE_HTTPS, False)
+            verify_ssl = user_input.get(OPTION_VERIFY_SSL, True)
+            cert_fingerprint = user_input.get(OPTION_CERT_FINGERPRINT, "").strip()
 
             _LOGGER.debug(
                 "Testing connection to Vodafone Station at %s with username %s",
@@ -48,10 +71,30 @@ class VodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 username,
             )
 
-            box = VodafoneBox(host)
+            box = VodafoneBox(
+                host,
+                TransportOptions.from_options(
+                    {
+                        OPTION_USE_HTTPS: use_https,
+                        OPTION_VERIFY_SSL: verify_ssl,
+                        OPTION_CERT_FINGERPRINT: cert_fingerprint,
+                    }
+                ),
+            )
             try:
+                if not (enable_binary_sensor or enable_device_tracker or enable_sensor):
+                    raise NoPlatformsSelected
+                if cert_fingerprint and not use_https:
+                    raise FingerprintWithoutHttps
+
                 await self.hass.async_add_executor_job(box.login, username, password)
                 _LOGGER.info("Connection test successful for %s", host)
+            except NoPlatformsSelected:
+                _LOGGER.error("Configuration rejected: no platforms selected")
+                errors["base"] = "no_platforms"
+            except FingerprintWithoutHttps:
+                _LOGGER.error("Configuration rejected: fingerprint set without HTTPS")
+                errors[OPTION_CERT_FINGERPRINT] = "fingerprint_requires_https"
             except Exception as e:
                 _LOGGER.error(
                     "Connection test failed for %s: %s", host, e, exc_info=True
@@ -68,9 +111,18 @@ class VodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         OPTION_MAC_FILTER: mac_filter,
                         OPTION_ENABLE_BINARY_SENSOR: enable_binary_sensor,
                         OPTION_ENABLE_DEVICE_TRACKER: enable_device_tracker,
+                        OPTION_ENABLE_SENSOR: enable_sensor,
+                        OPTION_MAC_GROUPS: mac_groups,
                         OPTION_SCAN_INTERVAL: scan_interval,
+                        OPTION_MIN_REFRESH_AGE: min_refresh_age,
+                        OPTION_USE_HTTPS: use_https,
+                        OPTION_VERIFY_SSL: verify_ssl,
+                        OPTION_CERT_FINGERPRINT: cert_fingerprint,
                     },
                 )
+            finally:
+                # The test session is not reused, release its connections
+                await self.hass.async_add_executor_job(box.close)
 
         schema = vol.Schema(
             {
@@ -80,9 +132,17 @@ class VodafoneConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Optional(OPTION_MAC_FILTER, default=""): str,
                 vol.Optional(OPTION_ENABLE_BINARY_SENSOR, default=True): bool,
                 vol.Optional(OPTION_ENABLE_DEVICE_TRACKER, default=True): bool,
+                vol.Optional(OPTION_ENABLE_SENSOR, default=True): bool,
+                vol.Optional(OPTION_MAC_GROUPS, default=""): str,
                 vol.Optional(
                     OPTION_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
                 ): vol.All(vol.Coerce(int), vol.Range(min=10, max=600)),
+                vol.Optional(
+                    OPTION_MIN_REFRESH_AGE, default=DEFAULT_MIN_REFRESH_AGE
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=600)),
+                vol.Optional(OPTION_USE_HTTPS, default=False): bool,
+                vol.Optional(OPTION_VERIFY_SSL, default=True): bool,
+                vol.Optional(OPTION_CERT_FINGERPRINT, default=""): str,
             }
         )
         return self.async_show_form(step_id="user", data_schema=schema, errors=errors)
@@ -105,11 +165,41 @@ class VodafoneOptionsFlow(config_entries.OptionsFlow):
             host = self.config_entry.data[ENTRY_DATA_HOST]
             username = user_input[OPTION_USERNAME]
             password = user_input[OPTION_PASSWORD]
+            transport_options = {
+                OPTION_USE_HTTPS: user_input.get(OPTION_USE_HTTPS, False),
+                OPTION_VERIFY_SSL: user_input.get(OPTION_VERIFY_SSL, True),
+                OPTION_CERT_FINGERPRINT: user_input.get(
+                    OPTION_CERT_FINGERPRINT, ""
+                ).strip(),
+            }
+            transport = TransportOptions.from_options(transport_options)
 
-            box = VodafoneBox(host)
+            box = VodafoneBox(host, transport)
             try:
-                await self.hass.async_add_executor_job(box.login, username, password)
-                _LOGGER.info("Options connection test successful")
+                if not (
+                    user_input[OPTION_ENABLE_BINARY_SENSOR]
+                    or user_input[OPTION_ENABLE_DEVICE_TRACKER]
+                    or user_input[OPTION_ENABLE_SENSOR]
+                ):
+                    raise NoPlatformsSelected
+                if (
+                    transport_options[OPTION_CERT_FINGERPRINT]
+                    and not transport_options[OPTION_USE_HTTPS]
+                ):
+                    raise FingerprintWithoutHttps
+
+                # A test login opens a second router session which can kick out
+                # the running one, so only do it when the connection changed.
+                current_options = self.config_entry.options
+                if (username, password, transport) != (
+                    current_options.get(OPTION_USERNAME),
+                    current_options.get(OPTION_PASSWORD),
+                    TransportOptions.from_options(current_options),
+                ):
+                    await self.hass.async_add_executor_job(
+                        box.login, username, password
+                    )
+                    _LOGGER.info("Options connection test successful")
 
                 return self.async_create_entry(
                     title="",
@@ -123,14 +213,28 @@ class VodafoneOptionsFlow(config_entries.OptionsFlow):
                         OPTION_ENABLE_DEVICE_TRACKER: user_input[
                             OPTION_ENABLE_DEVICE_TRACKER
                         ],
+                        OPTION_ENABLE_SENSOR: user_input[OPTION_ENABLE_SENSOR],
+                        OPTION_MAC_GROUPS: user_input.get(OPTION_MAC_GROUPS, ""),
                         OPTION_SCAN_INTERVAL: user_input.get(
                             OPTION_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                         ),
+                        OPTION_MIN_REFRESH_AGE: user_input.get(
+                            OPTION_MIN_REFRESH_AGE, DEFAULT_MIN_REFRESH_AGE
+                        ),
+                        **transport_options,
                     },
                 )
+            except NoPlatformsSelected:
+                _LOGGER.error("Options rejected: no platforms selected")
+                errors["base"] = "no_platforms"
+            except FingerprintWithoutHttps:
+                _LOGGER.error("Options rejected: fingerprint set without HTTPS")
+                errors[OPTION_CERT_FINGERPRINT] = "fingerprint_requires_https"
             except Exception as e:
                 _LOGGER.error("Options connection test failed: %s", e, exc_info=True)
                 errors["base"] = "cannot_connect"
+            finally:
+                await self.hass.async_add_executor_job(box.close)
 
         current_options = self.config_entry.options
 
@@ -154,12 +258,38 @@ class VodafoneOptionsFlow(config_entries.OptionsFlow):
                     OPTION_ENABLE_DEVICE_TRACKER,
                     default=current_options.get(OPTION_ENABLE_DEVICE_TRACKER, True),
                 ): bool,
+                vol.Optional(
+                    OPTION_ENABLE_SENSOR,
+                    default=current_options.get(OPTION_ENABLE_SENSOR, True),
+                ): bool,
+                vol.Optional(
+                    OPTION_MAC_GROUPS,
+                    default=current_options.get(OPTION_MAC_GROUPS, ""),
+                ): str,
                 vol.Optional(
                     OPTION_SCAN_INTERVAL,
                     default=current_options.get(
                         OPTION_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
                     ),
                 ): vol.All(vol.Coerce(int), vol.Range(min=10, max=600)),
+                vol.Optional(
+                    OPTION_MIN_REFRESH_AGE,
+                    default=current_options.get(
+                        OPTION_MIN_REFRESH_AGE, DEFAULT_MIN_REFRESH_AGE
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=600)),
+                vol.Optional(
+                    OPTION_USE_HTTPS,
+                    default=current_options.get(OPTION_USE_HTTPS, False),
+                ): bool,
+                vol.Optional(
+                    OPTION_VERIFY_SSL,
+                    default=current_options.get(OPTION_VERIFY_SSL, True),
+                ): bool,
+                vol.Optional(
+                    OPTION_CERT_FINGERPRINT,
+                    default=current_options.get(OPTION_CERT_FINGERPRINT, ""),
+                ): str,
             }
         )
 
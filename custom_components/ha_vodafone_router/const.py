@@ -1,6 +1,12 @@
-DOMAIN = "vodafone_router_device_polling"
+DOMAIN = "ha_vodafone_router"
 
 DEFAULT_SCAN_INTERVAL = 30
+# Seconds; entity refresh requests while the data is newer than this hit the cache
+DEFAULT_MIN_REFRESH_AGE = 10
+# Seconds unload may spend logging out and flushing before giving up
+UNLOAD_TIMEOUT = 5.0
+UNREACHABLE_BACKOFF_MAX = 600  # seconds between liveness probes at most
+REFRESH_COALESCE_WINDOW = 1.0  # seconds; refresh requests within it share one fetch
 
 ENTRY_DATA_HOST = "host"
 OPTION_USERNAME = "username"
@@ -11,6 +17,12 @@ OPTION_MAC_FILTER = (
 )
 OPTION_ENABLE_BINARY_SENSOR = "enable_binary_sensor"
 OPTION_ENABLE_DEVICE_TRACKER = "enable_device_tracker"
+OPTION_MIN_REFRESH_AGE = "min_refresh_age"
+OPTION_ENABLE_SENSOR = "enable_sensor"
+OPTION_MAC_GROUPS = "mac_groups"  # "name=mac,mac; other=mac" counted by sensors
+OPTION_USE_HTTPS = "use_https"
+OPTION_VERIFY_SSL = "verify_ssl"
+OPTION_CERT_FINGERPRINT = "cert_fingerprint"  # pins the router's TLS certificate
 
 ROUTER_PROPERTY_LAN_DEVICES = "lanDevices"
 ROUTER_PROPERTY_WLAN_DEVICES = "wlanDevices"
@@ -19,3 +31,38 @@ DEVICE_PROPERTY_MAC_ADDRESS = "MAC"
 DEVICE_PROPERTY_HOSTNAME = "HostName"
 DEVICE_PROPERTY_IP_ADDRESS = "IP"
 DEVICE_PROPERTY_NAME = "name"
+
+# hass.data[DOMAIN] keys shared across config entries
+DATA_HOSTS = "hosts"  # host -> shared VodafoneDeviceCoordinator
+DATA_HOSTS_LOCK = "hosts_lock"
+
+# Connection type attached to normalized device records
+DEVICE_PROPERTY_CONNECTION = "connection"
+CONNECTION_LAN = "lan"
+CONNECTION_WLAN = "wlan"
+
+# Connection history attributes
+ATTR_LAST_SEEN = "last_seen"
+ATTR_CONNECTED_SINCE = "connected_since"
+ATTR_SESSION_DURATION = "session_duration"
+ATTR_CONNECTED_TODAY = "connected_today"
+
+# Only present while the router is unreachable and the last known data is shown
+ATTR_STALE = "stale"
+ATTR_UNREACHABLE_SINCE = "unreachable_since"
+
+# Services
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+DEFAULT_PROFILE_CYCLES = 1
+SERVICE_GET_HISTORY = "get_history"
+ATTR_MAC = "mac"
+ATTR_SINCE = "since"
+ATTR_UNTIL = "until"
+ATTR_LIMIT = "limit"
+DEFAULT_HISTORY_LIMIT = 100
+SERVICE_GET_DEVICES = "get_devices"
+ATTR_HOSTNAME_PREFIX = "hostname_prefix"
+ATTR_CONNECTION = "connection"
+ATTR_MAX_AGE = "max_age"
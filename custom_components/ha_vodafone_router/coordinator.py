@@ -1,17 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
 import logging
-import json
+import time
 from datetime import timedelta
+from functools import partial
+from typing import TYPE_CHECKING
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CONNECTED_SINCE,
+    ATTR_LAST_SEEN,
+    ATTR_STALE,
+    ATTR_UNREACHABLE_SINCE,
+    DATA_HOSTS,
+    DATA_HOSTS_LOCK,
+    DEFAULT_MIN_REFRESH_AGE,
+    DEFAULT_SCAN_INTERVAL,
+    DEVICE_PROPERTY_CONNECTION,
+    DEVICE_PROPERTY_IP_ADDRESS,
+    DEVICE_PROPERTY_MAC_ADDRESS,
+    DOMAIN,
+    REFRESH_COALESCE_WINDOW,
+    UNLOAD_TIMEOUT,
+    UNREACHABLE_BACKOFF_MAX,
+    ROUTER_PROPERTY_LAN_DEVICES,
+    ROUTER_PROPERTY_WLAN_DEVICES,
+)
+from .devices import DeviceDelta, diff_devices, index_devices, normalize_devices
+from .history import ConnectionHistory
+from .presence_log import EVENT_JOIN, EVENT_LEAVE, PresenceLog
+from .vodafone_box import (
+    LOGIN_ENDPOINTS,
+    DeadlineExceeded,
+    RequestTimeout,
+    RouterUnreachable,
+    TransportOptions,
+    VodafoneBox,
+)
 
-from custom_components.vodafone_router_device_polling.const import DEFAULT_SCAN_INTERVAL
-from .vodafone_box import VodafoneBox
+if TYPE_CHECKING:
+    from .profiler import PollProfiler
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def parse_mac_groups(mac_groups: str) -> dict[str, set[str]]:
+    """Parse a "name=mac,mac; other=mac" option into named MAC sets."""
+    groups = {}
+    for group in (mac_groups or "").split(";"):
+        name, _, macs = group.partition("=")
+        if name.strip() and macs.strip():
+            groups[name.strip()] = parse_mac_filter(macs)
+    return groups
+
+
+def parse_mac_filter(mac_filter: str) -> set[str] | None:
+    """Parse a comma-separated MAC filter option into a normalized set."""
+    if not mac_filter or not mac_filter.strip():
+        return None
+
+    return {
+        mac.strip().lower().replace("-", ":")
+        for mac in mac_filter.split(",")
+        if mac.strip()
+    }
+
+
 class VodafoneDeviceCoordinator(DataUpdateCoordinator):
-    """Coordinator to poll Vodafone Station devices."""
+    """Coordinator to poll Vodafone Station devices.
+
+    A single coordinator is shared by all config entries pointing at the same
+    host, so the router only sees one session and one poll per interval.
+    """
 
     def __init__(
         self,
@@ -20,7 +87,7 @@ class VodafoneDeviceCoordinator(DataUpdateCoordinator):
         username: str,
         password: str,
         scan_interval: int = DEFAULT_SCAN_INTERVAL,
-        mac_filter: str = "",
+        transport: TransportOptions = TransportOptions(),
     ):
         """Initialize."""
         _LOGGER.info(
@@ -28,56 +95,188 @@ class VodafoneDeviceCoordinator(DataUpdateCoordinator):
             host,
             scan_interval,
         )
-        self.box = VodafoneBox(host)
+        self.host = host
+        self.box = VodafoneBox(host, transport)
         self.username = username
         self.password = password
         self._update_count = 0  # Track update cycles
-
-        if mac_filter.strip():
-            self.mac_filter = {
-                mac.strip().lower().replace("-", ":")
-                for mac in mac_filter.split(",")
-                if mac.strip()
-            }
-            _LOGGER.info(
-                "MAC filter enabled for %s devices: %s",
-                len(self.mac_filter),
-                list(self.mac_filter),
-            )
-        else:
-            self.mac_filter = None
-            _LOGGER.info("No MAC filter - all devices will be included")
+        self._entry_intervals: dict[str, int] = {}
+        self.last_fetch: float | None = None  # monotonic time of last good fetch
+        self.devices: dict[str, dict] = {}  # MAC -> device record of last fetch
+        self.last_delta = DeviceDelta({}, {}, {})
+        self.delta_serial = 0  # incremented whenever last_delta is replaced
+        self.history = ConnectionHistory()
+        self.presence_log: PresenceLog | None = None
+        self._unsub_stop: CALLBACK_TYPE | None = None
+        self._fresh_task: asyncio.Task | None = None
+        # Refreshes from the timer, services and entities can overlap
+        self._poll_tasks: set[asyncio.Task] = set()
+        self._profiler: PollProfiler | None = None
+        self.unreachable_since: float | None = None  # POSIX time of first failure
+        self._backoff = 0.0
+        self._next_attempt = 0.0
 
         _LOGGER.debug(
             "Setting up coordinator with update interval: %s seconds", scan_interval
         )
 
+        # The coordinator outlives individual entries, so it must not bind its
+        # lifecycle to whichever entry happened to create it.
         super().__init__(
             hass,
             _LOGGER,
-            name="Vodafone Devices",
+            config_entry=None,
+            name=f"Vodafone Devices ({host})",
             update_interval=timedelta(seconds=scan_interval),
+            # Entity-triggered refreshes arriving within the window share one
+            # fetch instead of each hitting the router.
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=REFRESH_COALESCE_WINDOW,
+                immediate=False,
+            ),
+        )
+
+    @property
+    def data_age(self) -> float | None:
+        """Return the age of the last successful fetch in seconds."""
+        if self.last_fetch is None:
+            return None
+        return time.monotonic() - self.last_fetch
+
+    async def async_ensure_fresh(self, max_age: float) -> None:
+        """Fetch now if the cached data is older than max_age seconds.
+
+        Concurrent callers share a single fetch.
+        """
+        age = self.data_age
+        if age is not None and age <= max_age:
+            return
+
+        if self._fresh_task is None or self._fresh_task.done():
+            _LOGGER.debug("Cached data too old for caller (%s s), fetching", age)
+            self._fresh_task = self.hass.async_create_task(self.async_refresh())
+        await asyncio.shield(self._fresh_task)
+
+    @property
+    def entry_ids(self) -> set[str]:
+        """Return the config entries currently using this coordinator."""
+        return set(self._entry_intervals)
+
+    def attach_entry(self, entry_id: str, scan_interval: int) -> None:
+        """Register a config entry and poll at the fastest requested interval."""
+        self._entry_intervals[entry_id] = scan_interval
+        self._apply_update_interval()
+
+    def detach_entry(self, entry_id: str) -> bool:
+        """Unregister a config entry. Return True if no entries remain."""
+        self._entry_intervals.pop(entry_id, None)
+        self._apply_update_interval()
+        return not self._entry_intervals
+
+    def _apply_update_interval(self) -> None:
+        if not self._entry_intervals:
+            return
+
+        interval = timedelta(seconds=min(self._entry_intervals.values()))
+        if interval != self.update_interval:
+            _LOGGER.debug(
+                "Update interval for %s changed to %s seconds",
+                self.host,
+                interval.total_seconds(),
+            )
+            self.update_interval = interval
+
+    def _profiled(self, func):
+        """Return func, wrapped in the active profiler if there is one."""
+        if self._profiler is None:
+            return func
+        return partial(self._profiler.run, func)
+
+    async def async_start_profiling(self, cycles: int) -> None:
+        """Profile the next poll cycles and write a report afterwards."""
+        if self._profiler is not None:
+            _LOGGER.warning("Profiling of %s is already running", self.host)
+            return
+
+        # cProfile, pstats and tracemalloc are rarely needed and slow to import,
+        # so load them on demand and off the event loop
+        profiler = await self.hass.async_add_import_executor_job(
+            importlib.import_module, f"{__package__}.profiler"
+        )
+        if self._profiler is not None:
+            return
+
+        _LOGGER.info("Profiling the next %s poll cycles of %s", cycles, self.host)
+        self._profiler = profiler.PollProfiler(cycles)
+
+    async def _async_finish_profiling(self) -> None:
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return
+
+        snapshot = profiler.stop()
+        base_path = self.hass.config.path(
+            f"{DOMAIN}_profile_{self.host.replace(':', '_')}"
+        )
+        await self.hass.async_add_executor_job(
+            profiler.write_report, snapshot, base_path
         )
 
-    async def async_login(self):
+    @callback
+    def async_update_listeners(self) -> None:
+        """Dispatch to entities, profiled while a capture is running."""
+        if self._profiler is None:
+            super().async_update_listeners()
+        else:
+            self._profiler.run(super().async_update_listeners)
+
+    async def async_login(self, deadline: float | None = None):
         """Login to Vodafone Station."""
         _LOGGER.info(
             "Attempting to login to Vodafone Station for user: %s", self.username
         )
         try:
             await self.hass.async_add_executor_job(
-                self.box.login, self.username, self.password
+                self._profiled(self.box.login), self.username, self.password, deadline
             )
             _LOGGER.info("Successfully logged in to Vodafone Station")
         except Exception as e:
             _LOGGER.error("Failed to login to Vodafone Station: %s", e)
             raise
 
-    async def async_logout(self):
+    async def async_set_transport(self, transport: TransportOptions) -> None:
+        """Switch to a new transport, keeping the current one if login fails."""
+        _LOGGER.info("Switching %s to %s", self.host, transport)
+        box = VodafoneBox(self.host, transport)
+        try:
+            await self.hass.async_add_executor_job(
+                box.login, self.username, self.password
+            )
+        except Exception:
+            box.close()
+            raise
+
+        previous, self.box = self.box, box
+        # Release the old session on the router too, bounded like an unload
+        deadline = time.monotonic() + UNLOAD_TIMEOUT
+        try:
+            await asyncio.wait_for(
+                self.hass.async_add_executor_job(previous.logout, deadline),
+                UNLOAD_TIMEOUT,
+            )
+        except Exception as err:
+            _LOGGER.warning(
+                "Failed to logout the previous session with %s: %s", self.host, err
+            )
+        await self.hass.async_add_executor_job(previous.close)
+
+    async def async_logout(self, deadline: float | None = None):
         """Logout from Vodafone Station."""
         _LOGGER.info("Attempting to logout from Vodafone Station")
         try:
-            await self.hass.async_add_executor_job(self.box.logout)
+            await self.hass.async_add_executor_job(self.box.logout, deadline)
             _LOGGER.info("Successfully logged out from Vodafone Station")
         except Exception as e:
             _LOGGER.error("Failed to logout from Vodafone Station: %s", e)
@@ -87,71 +286,516 @@ class VodafoneDeviceCoordinator(DataUpdateCoordinator):
         """Fetch connected devices."""
         _LOGGER.debug("Starting device data update (cycle %s)", self._update_count)
         self._update_count += 1
+        task = asyncio.current_task()
+        self._poll_tasks.add(task)
+
+        # A cycle must finish before the next one is due, otherwise slow
+        # retries and re-logins pile up behind each other.
+        deadline = time.monotonic() + self.update_interval.total_seconds()
 
+        try:
+            if self.unreachable_since is not None:
+                if time.monotonic() < self._next_attempt:
+                    _LOGGER.debug(
+                        "Router %s unreachable, next attempt in %.0fs",
+                        self.host,
+                        self._next_attempt - time.monotonic(),
+                    )
+                    return self._stale_data()
+
+                # A cheap TCP probe instead of a full login against a dead router
+                if not await self.hass.async_add_executor_job(self.box.probe):
+                    self._schedule_next_attempt()
+                    return self._stale_data()
+                _LOGGER.info("Router %s answers again, resuming polling", self.host)
+
+            try:
+                data = await self._async_fetch_devices(deadline)
+            except RouterUnreachable as err:
+                if self.unreachable_since is None:
+                    _LOGGER.warning(
+                        "Router %s unreachable, keeping last known data: %s",
+                        self.host,
+                        err,
+                    )
+                    self.unreachable_since = time.time()
+                    self._backoff = 0.0
+                self._schedule_next_attempt()
+                return self._stale_data()
+
+            if self.unreachable_since is not None:
+                _LOGGER.info("Router %s reachable again", self.host)
+                self.unreachable_since = None
+            return data
+        finally:
+            self._poll_tasks.discard(task)
+            if self._profiler is not None and self._profiler.cycle_done():
+                # Finish after this cycle's listeners have been dispatched
+                self.hass.async_create_task(self._async_finish_profiling())
+
+    def async_cancel_poll(self) -> None:
+        """Cancel the poll cycles that are currently running, if any.
+
+        The executor job of a blocking request cannot be interrupted, but its
+        result is discarded and nobody waits for its timeout.
+        """
+        for task in self._poll_tasks:
+            if not task.done():
+                _LOGGER.debug("Cancelling in-flight poll of %s", self.host)
+                task.cancel()
+        if self._fresh_task is not None and not self._fresh_task.done():
+            self._fresh_task.cancel()
+
+    @callback
+    def async_start_presence_log(self) -> None:
+        """Start the presence log writer and flush it when Home Assistant stops.
+
+        Entries are not unloaded on shutdown, so async_close alone would leave
+        the last batch of events unwritten.
+        """
+        self.presence_log.start()
+        self._unsub_stop = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_close_presence_log
+        )
+
+    async def _async_close_presence_log(self, _event: Event) -> None:
+        self._unsub_stop = None
+        await self.hass.async_add_executor_job(self.presence_log.close, UNLOAD_TIMEOUT)
+
+    async def async_close(self) -> None:
+        """Stop polling, logout and release the router connections.
+
+        Bounded by UNLOAD_TIMEOUT even when the router does not answer, so a
+        dead router cannot hold up a reload or Home Assistant shutdown.
+        """
+        await self.async_shutdown()
+        self.async_cancel_poll()
+        if self._unsub_stop is not None:
+            self._unsub_stop()
+            self._unsub_stop = None
+        # A capture cut short by the unload still gets its report, and
+        # allocation tracing must not stay on for the rest of the process.
+        try:
+            await self._async_finish_profiling()
+        except Exception as err:
+            _LOGGER.warning(
+                "Failed to write profiling report for %s: %s", self.host, err
+            )
+
+        deadline = time.monotonic() + UNLOAD_TIMEOUT
+        results = await asyncio.gather(
+            asyncio.wait_for(self.async_logout(deadline), UNLOAD_TIMEOUT),
+            asyncio.wait_for(
+                self.hass.async_add_executor_job(
+                    self.presence_log.close, UNLOAD_TIMEOUT
+                ),
+                UNLOAD_TIMEOUT,
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.warning(
+                    "Failed to close session with %s cleanly: %s",
+                    self.host,
+                    result or type(result).__name__,
+                )
+
+        self.box.close()
+
+    def _schedule_next_attempt(self) -> None:
+        """Back off exponentially between attempts while the router is down."""
+        self._backoff = min(
+            UNREACHABLE_BACKOFF_MAX,
+            self._backoff * 2 or self.update_interval.total_seconds(),
+        )
+        self._next_attempt = time.monotonic() + self._backoff
+        _LOGGER.debug("Next attempt to reach %s in %.0fs", self.host, self._backoff)
+
+    def _stale_data(self):
+        """Return the last known data, flagged by the entities as stale."""
+        if self.data is None:
+            raise UpdateFailed(f"Router {self.host} is unreachable")
+        return self.data
+
+    async def _async_fetch_devices(self, deadline: float):
         try:
             raw_device_data = await self.hass.async_add_executor_job(
-                self.box.get_connected_devices
+                self._profiled(self.box.get_connected_devices), deadline
             )
 
-            return self._process_device_data(raw_device_data)
+            return self._profiled(self._process_device_data)(raw_device_data)
+        except RouterUnreachable:
+            raise
+        except (DeadlineExceeded, RequestTimeout) as err:
+            # A slow reply fails this cycle only, the router is still reachable
+            _LOGGER.warning("Device update cancelled: %s", err)
+            raise UpdateFailed(f"Device update cancelled: {err}") from err
         except Exception as err:
             if "Session lost" in str(err):
+                expected = self.box.expected_latency(
+                    *LOGIN_ENDPOINTS, "overview_data.php"
+                )
+                if time.monotonic() + expected > deadline:
+                    _LOGGER.warning(
+                        "Session lost, postponing re-authentication to the next cycle"
+                    )
+                    raise UpdateFailed("Session lost and no time left to re-login")
+
                 _LOGGER.warning("Session lost, attempting re-authentication ...")
                 try:
-                    await self.async_login()
+                    await self.async_login(deadline)
                     raw_data = await self.hass.async_add_executor_job(
-                        self.box.get_connected_devices
+                        self._profiled(self.box.get_connected_devices), deadline
                     )
-                    return self._process_device_data(raw_data)
+                    return self._profiled(self._process_device_data)(raw_data)
+                except RouterUnreachable:
+                    raise
                 except Exception as retry_err:
                     _LOGGER.error("Re-authentication failed: %s", retry_err)
                     raise UpdateFailed(f"Auth failure: {retry_err}") from retry_err
-            
+
             _LOGGER.error("Unexpected update failure: %s", err)
-            raise UpdateFailed(f"Communication error: {err}") from err    
+            raise UpdateFailed(f"Communication error: {err}") from err
 
     def _process_device_data(self, data):
-        """Normalize MACs and apply filtering to the raw data."""
+        """Normalize MACs of the raw data. Filtering is left to each entry's view."""
+        self.last_fetch = time.monotonic()
         if not data:
-            return self.data or {"lanDevices": [], "wlanDevices": []}
+            return self.data or {
+                ROUTER_PROPERTY_LAN_DEVICES: [],
+                ROUTER_PROPERTY_WLAN_DEVICES: [],
+            }
+
+        normalize_devices(data)
+        current = index_devices(data)
+        self.last_delta = diff_devices(self.devices, current)
+        self.delta_serial += 1
+        self.devices = current
+        now = time.time()
+        self.history.apply(self.last_delta, now)
+        # The first fetch only establishes the baseline, logging it would record
+        # a join for every device on each restart.
+        if self.presence_log is not None and self.delta_serial > 1:
+            self._log_presence(self.last_delta, now)
+
+        lan_count = len(data.get(ROUTER_PROPERTY_LAN_DEVICES, []))
+        wifi_count = len(data.get(ROUTER_PROPERTY_WLAN_DEVICES, []))
+        _LOGGER.info(
+            "Device update successful: %s LAN devices, %s WIFI devices",
+            lan_count,
+            wifi_count,
+        )
+        _LOGGER.debug("Updated device data: %s", data)
+
+        return data
 
-        for device in data.get("lanDevices", []):
-            if device.get("MAC"):
-                device["MAC"] = device["MAC"].lower()
+    def _log_presence(self, delta: DeviceDelta, timestamp: float) -> None:
+        for event, records in ((EVENT_LEAVE, delta.left), (EVENT_JOIN, delta.joined)):
+            for mac, record in records.items():
+                self.presence_log.append(
+                    timestamp,
+                    mac,
+                    event,
+                    record.get(DEVICE_PROPERTY_CONNECTION),
+                    record.get(DEVICE_PROPERTY_IP_ADDRESS),
+                )
+
+    def device_attributes(self, mac: str) -> dict:
+        """Return connection history and staleness attributes for a device.
+
+        Only values that change at presence transitions are included, so an
+        entity's state is not rewritten on polls where nothing happened.
+        """
+        attributes = {}
+        if self.unreachable_since is not None:
+            attributes[ATTR_STALE] = True
+            attributes[ATTR_UNREACHABLE_SINCE] = dt_util.utc_from_timestamp(
+                self.unreachable_since
+            )
+
+        history = self.history.get(mac)
+        if history is None:
+            return attributes
+
+        if history.is_connected:
+            attributes[ATTR_CONNECTED_SINCE] = dt_util.utc_from_timestamp(
+                history.connected_since
+            )
+        else:
+            last_seen = history.last_seen(0.0)
+            if last_seen is not None:
+                attributes[ATTR_LAST_SEEN] = dt_util.utc_from_timestamp(last_seen)
+        return attributes
+
+    def device_connected_time(self, mac: str) -> tuple[int | None, int | None]:
+        """Return the current session length and today's connected time in seconds."""
+        history = self.history.get(mac)
+        if history is None:
+            return None, None
+
+        now = self.history.updated_at or time.time()
+        session = history.session_duration(now)
+        midnight = dt_util.start_of_local_day().timestamp()
+        return (
+            round(session) if session is not None else None,
+            round(history.connected_time(midnight, now)),
+        )
 
+
+class VodafoneDeviceView:
+    """Per-entry view applying a MAC filter to a shared host coordinator.
+
+    Entities talk to the view as if it were the coordinator. The filtered data
+    is computed once per coordinator update and cached until the next one.
+    """
+
+    def __init__(
+        self,
+        coordinator: VodafoneDeviceCoordinator,
+        mac_filter: str = "",
+        min_refresh_age: int = DEFAULT_MIN_REFRESH_AGE,
+        mac_groups: str = "",
+    ):
+        self.coordinator = coordinator
+        self.mac_filter = parse_mac_filter(mac_filter)
+        self.mac_groups = parse_mac_groups(mac_groups)
+        self.min_refresh_age = min_refresh_age
+        self.options_version = 0  # incremented when filter or groups change
+        self.platforms: list[str] = []  # platforms currently loaded for the entry
+        self.tracked_macs: dict[str, set[str]] = {}  # platform -> MACs with entities
+        self._platform_unsubs: dict[str, CALLBACK_TYPE] = {}
+        self._subscriptions: set[CALLBACK_TYPE] = set()  # end callbacks
+        self._source = None
+        self._data = None
+        self._log_mac_filter()
+
+    def _log_mac_filter(self) -> None:
         if self.mac_filter:
-            original_lan_count = len(data.get("lanDevices", []))
-            original_wlan_count = len(data.get("wlanDevices", []))
+            _LOGGER.info(
+                "MAC filter enabled for %s devices: %s",
+                len(self.mac_filter),
+                list(self.mac_filter),
+            )
+        else:
+            _LOGGER.info("No MAC filter - all devices will be included")
 
-            filtered_lan = [
-                d
-                for d in data.get("lanDevices", [])
-                if d.get("MAC", "") in self.mac_filter
-            ]
-            filtered_wifi = [
+    def update_options(
+        self, mac_filter: str, min_refresh_age: int, mac_groups: str = ""
+    ) -> None:
+        """Apply changed entry options without touching the shared session."""
+        self.mac_filter = parse_mac_filter(mac_filter)
+        self.mac_groups = parse_mac_groups(mac_groups)
+        self.min_refresh_age = min_refresh_age
+        self.options_version += 1
+        self._source = None
+        self._data = None
+        self._log_mac_filter()
+
+    def includes(self, mac: str) -> bool:
+        """Return True if the MAC filter covers the device."""
+        return not self.mac_filter or mac in self.mac_filter
+
+    @property
+    def hass(self) -> HomeAssistant:
+        return self.coordinator.hass
+
+    @property
+    def data(self):
+        """Return the coordinator data restricted to this entry's MAC filter."""
+        source = self.coordinator.data
+        if not self.mac_filter or source is None:
+            return source
+
+        if source is not self._source:
+            self._source = source
+            self._data = self._apply_filter(source)
+        return self._data
+
+    def _apply_filter(self, data):
+        filtered = {
+            dev_list_name: [
                 d
-                for d in data.get("wlanDevices", [])
-                if d.get("MAC", "") in self.mac_filter
+                for d in data.get(dev_list_name, [])
+                if d.get(DEVICE_PROPERTY_MAC_ADDRESS, "") in self.mac_filter
             ]
+            for dev_list_name in (
+                ROUTER_PROPERTY_LAN_DEVICES,
+                ROUTER_PROPERTY_WLAN_DEVICES,
+            )
+        }
+        _LOGGER.debug(
+            "MAC filtering applied: LAN %s->%s, WIFI %s->%s",
+            len(data.get(ROUTER_PROPERTY_LAN_DEVICES, [])),
+            len(filtered[ROUTER_PROPERTY_LAN_DEVICES]),
+            len(data.get(ROUTER_PROPERTY_WLAN_DEVICES, [])),
+            len(filtered[ROUTER_PROPERTY_WLAN_DEVICES]),
+        )
+        return filtered
 
-            data["lanDevices"] = filtered_lan
-            data["wlanDevices"] = filtered_wifi
+    def device_attributes(self, mac: str) -> dict:
+        return self.coordinator.device_attributes(mac)
 
-            _LOGGER.debug(
-                "MAC filtering applied: LAN %s->%s, WIFI %s->%s",
-                original_lan_count,
-                len(filtered_lan),
-                original_wlan_count,
-                len(filtered_wifi),
-            )
+    def device_connected_time(self, mac: str) -> tuple[int | None, int | None]:
+        return self.coordinator.device_connected_time(mac)
+
+    def untracked_devices(self, platform: str) -> list[dict]:
+        """Return devices of the filtered data without an entity on a platform."""
+        tracked = self.tracked_macs.setdefault(platform, set())
+        devices = []
+        for dev_list_name in (
+            ROUTER_PROPERTY_LAN_DEVICES,
+            ROUTER_PROPERTY_WLAN_DEVICES,
+        ):
+            for device in (self.data or {}).get(dev_list_name, []):
+                mac = device.get(DEVICE_PROPERTY_MAC_ADDRESS)
+                if not mac:
+                    _LOGGER.debug("Skipping device without MAC address: %s", device)
+                    continue
+                if mac not in tracked:
+                    tracked.add(mac)
+                    devices.append(device)
+        return devices
+
+    @callback
+    def async_add_platform_listener(self, platform: str, update_callback) -> None:
+        """Listen for updates until the platform is unloaded."""
+        self.async_remove_platform_listener(platform)
+        self._platform_unsubs[platform] = self.async_add_listener(update_callback)
 
-        lan_count = len(data.get("lanDevices", []))
-        wifi_count = len(data.get("wlanDevices", []))
+    @callback
+    def async_remove_platform_listener(self, platform: str) -> None:
+        unsub = self._platform_unsubs.pop(platform, None)
+        if unsub is not None:
+            unsub()
+        self.tracked_macs.pop(platform, None)
+
+    @callback
+    def async_remove_entity(self, platform: str, entity) -> None:
+        """Remove an entity whose device is no longer covered by the filter."""
         _LOGGER.info(
-            "Device update successful: %s LAN devices, %s WIFI devices",
-            lan_count,
-            wifi_count,
+            "Removing %s for %s, no longer included by the MAC filter",
+            entity.entity_id,
+            entity.mac,
         )
-        _LOGGER.debug("Updated device data: %s", data)
-        
-        return data
\ No newline at end of file
+        self.tracked_macs.get(platform, set()).discard(entity.mac)
+        registry = er.async_get(self.hass)
+        if registry.async_get(entity.entity_id) is not None:
+            # Removing the registry entry also removes the entity from its platform
+            registry.async_remove(entity.entity_id)
+        else:
+            self.hass.async_create_task(entity.async_remove())
+
+    def async_add_listener(self, update_callback, context=None) -> CALLBACK_TYPE:
+        return self.coordinator.async_add_listener(update_callback, context)
+
+    @callback
+    def async_track_subscription(self, end_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Track a websocket subscription until the entry is unloaded.
+
+        The coordinator is shared per host and may outlive the entry, so its
+        listeners alone would keep a subscription alive after an unload.
+        """
+        self._subscriptions.add(end_callback)
+        return lambda: self._subscriptions.discard(end_callback)
+
+    @callback
+    def async_end_subscriptions(self) -> None:
+        """End all websocket subscriptions of the entry."""
+        for end_callback in list(self._subscriptions):
+            end_callback()
+        self._subscriptions.clear()
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh unless the cached data is fresh enough."""
+        age = self.coordinator.data_age
+        if (
+            self.coordinator.last_update_success
+            and age is not None
+            and age < self.min_refresh_age
+        ):
+            _LOGGER.debug("Serving refresh request from cache (data is %.1fs old)", age)
+            return
+
+        await self.coordinator.async_request_refresh()
+
+
+async def async_acquire_coordinator(
+    hass: HomeAssistant,
+    entry_id: str,
+    host: str,
+    username: str,
+    password: str,
+    scan_interval: int = DEFAULT_SCAN_INTERVAL,
+    transport: TransportOptions = TransportOptions(),
+) -> VodafoneDeviceCoordinator:
+    """Return the shared coordinator for a host, logging in on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    hosts: dict[str, VodafoneDeviceCoordinator] = domain_data.setdefault(DATA_HOSTS, {})
+    lock: asyncio.Lock = domain_data.setdefault(DATA_HOSTS_LOCK, asyncio.Lock())
+
+    async with lock:
+        coordinator = hosts.get(host)
+        if coordinator is not None:
+            _LOGGER.info(
+                "Reusing existing session for %s (shared with %s entries)",
+                host,
+                len(coordinator.entry_ids),
+            )
+            if coordinator.box.transport != transport:
+                _LOGGER.warning(
+                    "Transport options of entry %s differ from the shared session "
+                    "with %s, which keeps using %s",
+                    entry_id,
+                    host,
+                    coordinator.box.transport,
+                )
+            coordinator.attach_entry(entry_id, scan_interval)
+            return coordinator
+
+        coordinator = VodafoneDeviceCoordinator(
+            hass,
+            host=host,
+            username=username,
+            password=password,
+            scan_interval=scan_interval,
+            transport=transport,
+        )
+        coordinator.presence_log = PresenceLog(
+            hass.config.path(f"{DOMAIN}_presence_{host.replace(':', '_')}.db")
+        )
+
+        _LOGGER.debug("Attempting initial login and data refresh")
+        try:
+            await coordinator.async_login()
+            await coordinator.async_refresh()
+            if not coordinator.last_update_success:
+                raise coordinator.last_exception or UpdateFailed(
+                    "Initial data refresh failed"
+                )
+        except Exception:
+            coordinator.box.close()
+            raise
+
+        coordinator.attach_entry(entry_id, scan_interval)
+        coordinator.async_start_presence_log()
+        hosts[host] = coordinator
+        return coordinator
+
+
+async def async_release_coordinator(
+    hass: HomeAssistant, entry_id: str, host: str
+) -> None:
+    """Detach an entry from its host coordinator, logging out after the last one."""
+    domain_data = hass.data.get(DOMAIN, {})
+    hosts: dict[str, VodafoneDeviceCoordinator] = domain_data.get(DATA_HOSTS, {})
+    lock: asyncio.Lock = domain_data.setdefault(DATA_HOSTS_LOCK, asyncio.Lock())
+
+    async with lock:
+        coordinator = hosts.get(host)
+        if coordinator is None or not coordinator.detach_entry(entry_id):
+            _LOGGER.debug("Session for %s still in use, keeping it", host)
+            return
+
+        hosts.pop(host, None)
+        await coordinator.async_close()
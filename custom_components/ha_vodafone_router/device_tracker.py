@@ -6,7 +6,8 @@ from typing import Any
 from homeassistant.components.device_tracker import TrackerEntity, SourceType
 from homeassistant.const import STATE_HOME, STATE_NOT_HOME
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
@@ -17,7 +18,7 @@ from .const import (
     ROUTER_PROPERTY_LAN_DEVICES,
     ROUTER_PROPERTY_WLAN_DEVICES,
 )
-from .coordinator import VodafoneDeviceCoordinator
+from .coordinator import VodafoneDeviceView
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,25 +33,16 @@ async def async_setup_entry(
         "Setting up Vodafone device tracker entities for entry: %s", entry.entry_id
     )
 
-    coordinator: VodafoneDeviceCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator: VodafoneDeviceView = hass.data[DOMAIN][entry.entry_id]
 
     # Coordinator is already logged in and has data from __init__.py
     _LOGGER.debug("Using coordinator data for device tracker setup (already logged in)")
 
-    _LOGGER.debug("Creating device tracker entities from connected devices")
-    entities: list[VodafoneDeviceTracker] = []
-    total_devices = 0
-
-    for dev_list_name in (ROUTER_PROPERTY_LAN_DEVICES, ROUTER_PROPERTY_WLAN_DEVICES):
-        devices = coordinator.data.get(dev_list_name, [])
-        _LOGGER.debug("Processing %s devices from %s", len(devices), dev_list_name)
-
-        for device in devices:
-            total_devices += 1
-            if not device.get(DEVICE_PROPERTY_MAC_ADDRESS):
-                _LOGGER.warning("Skipping device without MAC address: %s", device)
-                continue
-
+    @callback
+    def _async_add_new_devices() -> None:
+        """Create entities for devices that do not have one yet."""
+        entities = []
+        for device in coordinator.untracked_devices(Platform.DEVICE_TRACKER):
             _LOGGER.debug(
                 "Creating tracker entity for device: %s (%s)",
                 device.get(DEVICE_PROPERTY_HOSTNAME, "Unknown"),
@@ -58,22 +50,26 @@ async def async_setup_entry(
             )
             entities.append(VodafoneDeviceTracker(coordinator, device))
 
-    _LOGGER.info(
-        "Created %s device tracker entities from %s total devices",
-        len(entities),
-        total_devices,
+        if entities:
+            _LOGGER.info("Created %s device tracker entities", len(entities))
+            async_add_entities(entities)
+
+    _async_add_new_devices()
+    # Picks up devices newly included by a changed MAC filter
+    coordinator.async_add_platform_listener(
+        Platform.DEVICE_TRACKER, _async_add_new_devices
     )
-    async_add_entities(entities)
 
 
 class VodafoneDeviceTracker(TrackerEntity):
     """Device tracker for a Vodafone Station connected device."""
 
+    _attr_should_poll = False
     _attr_source_type = SourceType.ROUTER
 
     def __init__(
         self,
-        coordinator: VodafoneDeviceCoordinator,
+        coordinator: VodafoneDeviceView,
         device: dict[str, Any],
     ) -> None:
         self.coordinator = coordinator
@@ -97,12 +93,19 @@ class VodafoneDeviceTracker(TrackerEntity):
             _LOGGER.debug("No coordinator data available for %s", self.mac)
             return STATE_NOT_HOME
 
-        connected_lan_macs = [d.get(DEVICE_PROPERTY_MAC_ADDRESS, "").lower() 
-                   for d in self.coordinator.data.get(ROUTER_PROPERTY_LAN_DEVICES, [])]
-        connected_wifi_macs = [d.get(DEVICE_PROPERTY_MAC_ADDRESS, "").lower() 
-                    for d in self.coordinator.data.get(ROUTER_PROPERTY_WLAN_DEVICES, [])]
-        
-        is_connected = self.mac.lower() in connected_lan_macs or self.mac.lower() in connected_wifi_macs
+        connected_lan_macs = [
+            d.get(DEVICE_PROPERTY_MAC_ADDRESS, "").lower()
+            for d in self.coordinator.data.get(ROUTER_PROPERTY_LAN_DEVICES, [])
+        ]
+        connected_wifi_macs = [
+            d.get(DEVICE_PROPERTY_MAC_ADDRESS, "").lower()
+            for d in self.coordinator.data.get(ROUTER_PROPERTY_WLAN_DEVICES, [])
+        ]
+
+        is_connected = (
+            self.mac.lower() in connected_lan_macs
+            or self.mac.lower() in connected_wifi_macs
+        )
 
         state = STATE_HOME if is_connected else STATE_NOT_HOME
         _LOGGER.debug(
@@ -115,16 +118,28 @@ class VodafoneDeviceTracker(TrackerEntity):
         """Return the location name of the device."""
         return STATE_HOME if self.state == STATE_HOME else None
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return connection history of the device and staleness of the data."""
+        return self.coordinator.device_attributes(self.mac)
+
     async def async_update(self) -> None:
         await self.coordinator.async_request_refresh()
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if not self.coordinator.includes(self.mac):
+            self.coordinator.async_remove_entity(Platform.DEVICE_TRACKER, self)
+            return
+        self.async_write_ha_state()
+
     async def async_added_to_hass(self) -> None:
         """Register for coordinator updates."""
         _LOGGER.debug(
             "Adding device tracker %s (%s) to Home Assistant", self._attr_name, self.mac
         )
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
         )
         _LOGGER.debug(
             "Registered device tracker %s for coordinator updates", self._attr_name
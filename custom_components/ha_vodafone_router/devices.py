@@ -0,0 +1,136 @@
+"""Helpers for normalizing and diffing router device tables.
+
+This module has no Home Assistant dependency so it can be shared between the
+coordinator and the standalone command-line poller.
+"""
+
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from .const import (
+    CONNECTION_LAN,
+    CONNECTION_WLAN,
+    DEVICE_PROPERTY_CONNECTION,
+    DEVICE_PROPERTY_MAC_ADDRESS,
+    ROUTER_PROPERTY_LAN_DEVICES,
+    ROUTER_PROPERTY_WLAN_DEVICES,
+)
+
+DEVICE_LISTS = {
+    ROUTER_PROPERTY_LAN_DEVICES: CONNECTION_LAN,
+    ROUTER_PROPERTY_WLAN_DEVICES: CONNECTION_WLAN,
+}
+
+
+class DeviceDelta(NamedTuple):
+    """Difference between two device tables, keyed by MAC address."""
+
+    joined: dict[str, dict[str, Any]]
+    left: dict[str, dict[str, Any]]
+    changed: dict[str, dict[str, Any]]
+
+    def __bool__(self) -> bool:
+        return bool(self.joined or self.left or self.changed)
+
+
+def normalize_devices(data: dict[str, list]) -> dict[str, list]:
+    """Lowercase all MAC addresses of a raw device table in place."""
+    for dev_list_name in DEVICE_LISTS:
+        for device in data.get(dev_list_name, []):
+            if device.get(DEVICE_PROPERTY_MAC_ADDRESS):
+                device[DEVICE_PROPERTY_MAC_ADDRESS] = device[
+                    DEVICE_PROPERTY_MAC_ADDRESS
+                ].lower()
+    return data
+
+
+def index_devices(data: dict[str, list] | None) -> dict[str, dict[str, Any]]:
+    """Return a MAC -> device record mapping tagged with the connection type."""
+    index: dict[str, dict[str, Any]] = {}
+    if not data:
+        return index
+
+    for dev_list_name, connection in DEVICE_LISTS.items():
+        for device in data.get(dev_list_name, []):
+            mac = device.get(DEVICE_PROPERTY_MAC_ADDRESS)
+            if mac:
+                index[mac] = {**device, DEVICE_PROPERTY_CONNECTION: connection}
+    return index
+
+
+def diff_devices(
+    previous: dict[str, dict[str, Any]], current: dict[str, dict[str, Any]]
+) -> DeviceDelta:
+    """Compare two indexed device tables."""
+    joined = {mac: rec for mac, rec in current.items() if mac not in previous}
+    left = {mac: rec for mac, rec in previous.items() if mac not in current}
+    changed = {
+        mac: rec
+        for mac, rec in current.items()
+        if mac in previous and previous[mac] != rec
+    }
+    return DeviceDelta(joined, left, changed)
+
+
+class PresenceCounter:
+    """Connected-device counts maintained incrementally from deltas.
+
+    Counts cover all devices accepted by `include` and are split by
+    connection type and by user-defined MAC groups. Applying a delta costs
+    O(changed devices).
+    """
+
+    def __init__(
+        self,
+        include: Callable[[str], bool] | None = None,
+        groups: dict[str, set[str]] | None = None,
+    ):
+        self._include = include or (lambda mac: True)
+        self._groups_of: dict[str, list[str]] = {}
+        for name, macs in (groups or {}).items():
+            for mac in macs:
+                self._groups_of.setdefault(mac, []).append(name)
+        self._connection: dict[str, str] = {}  # counted MAC -> connection type
+        self.by_connection = dict.fromkeys(DEVICE_LISTS.values(), 0)
+        self.by_group = dict.fromkeys(groups or {}, 0)
+
+    @property
+    def total(self) -> int:
+        return len(self._connection)
+
+    def reset(self, devices: dict[str, dict[str, Any]]) -> None:
+        """Recount from a full indexed device table."""
+        self._connection.clear()
+        self.by_connection = dict.fromkeys(self.by_connection, 0)
+        self.by_group = dict.fromkeys(self.by_group, 0)
+        for mac, record in devices.items():
+            self._add(mac, record)
+
+    def apply(self, delta: DeviceDelta) -> None:
+        for mac in delta.left:
+            self._remove(mac)
+        for mac, record in delta.changed.items():
+            if self._connection.get(mac) != record.get(DEVICE_PROPERTY_CONNECTION):
+                self._remove(mac)
+                self._add(mac, record)
+        for mac, record in delta.joined.items():
+            self._add(mac, record)
+
+    def _add(self, mac: str, record: dict[str, Any]) -> None:
+        if mac in self._connection or not self._include(mac):
+            return
+        connection = record.get(DEVICE_PROPERTY_CONNECTION)
+        self._connection[mac] = connection
+        if connection in self.by_connection:
+            self.by_connection[connection] += 1
+        for name in self._groups_of.get(mac, ()):
+            self.by_group[name] += 1
+
+    def _remove(self, mac: str) -> None:
+        connection = self._connection.pop(mac, None)
+        if connection is None:
+            return
+        if connection in self.by_connection:
+            self.by_connection[connection] -= 1
+        for name in self._groups_of.get(mac, ()):
+            self.by_group[name] -= 1
@@ -0,0 +1,71 @@
+"""Registry of known overview_data.php layouts of Vodafone Station firmwares.
+
+Each profile names the JavaScript variables holding the attached device
+tables and the router property they are merged into. Profiles are listed
+from most to least specific, so a layout with extra tables (guest or 5 GHz
+WLAN) is preferred over one that only matches its common subset.
+"""
+
+from typing import NamedTuple
+
+from .const import ROUTER_PROPERTY_LAN_DEVICES, ROUTER_PROPERTY_WLAN_DEVICES
+
+
+class FirmwareProfile(NamedTuple):
+    """Device tables of one firmware layout as (variable, router property)."""
+
+    name: str
+    tables: tuple[tuple[str, str], ...]
+
+    def matches(self, text: str) -> bool:
+        """Return True if all variables of the profile occur in the response."""
+        return all(f"{var_name} = " in text for var_name, _ in self.tables)
+
+
+_LAN = ("json_lanAttachedDevice", ROUTER_PROPERTY_LAN_DEVICES)
+_WLAN_PRIMARY = ("json_primaryWlanAttachedDevice", ROUTER_PROPERTY_WLAN_DEVICES)
+_WLAN_PRIMARY_5G = ("json_primaryWlan5gAttachedDevice", ROUTER_PROPERTY_WLAN_DEVICES)
+_WLAN_GUEST = ("json_guestWlanAttachedDevice", ROUTER_PROPERTY_WLAN_DEVICES)
+_WLAN_GUEST_5G = ("json_guestWlan5gAttachedDevice", ROUTER_PROPERTY_WLAN_DEVICES)
+
+FIRMWARE_PROFILES: list[FirmwareProfile] = [
+    FirmwareProfile(
+        "dual_band_guest",
+        (_LAN, _WLAN_PRIMARY, _WLAN_PRIMARY_5G, _WLAN_GUEST, _WLAN_GUEST_5G),
+    ),
+    FirmwareProfile("dual_band", (_LAN, _WLAN_PRIMARY, _WLAN_PRIMARY_5G)),
+    FirmwareProfile("primary_guest", (_LAN, _WLAN_PRIMARY, _WLAN_GUEST)),
+    # Layout of AR01.05.063.15 and earlier
+    FirmwareProfile("primary", (_LAN, _WLAN_PRIMARY)),
+]
+
+# Host -> profile that parsed its last response. Shared by all VodafoneBox
+# instances so the config flow, the coordinator and scripts/poll.py detect
+# only once.
+_DETECTED_PROFILES: dict[str, FirmwareProfile] = {}
+
+
+def register_profile(profile: FirmwareProfile, first: bool = True) -> None:
+    """Add a firmware layout to the registry."""
+    if first:
+        FIRMWARE_PROFILES.insert(0, profile)
+    else:
+        FIRMWARE_PROFILES.append(profile)
+
+
+def detect_profile(text: str) -> FirmwareProfile | None:
+    """Return the most specific profile matching an overview response."""
+    return next(
+        (profile for profile in FIRMWARE_PROFILES if profile.matches(text)), None
+    )
+
+
+def get_cached_profile(host: str) -> FirmwareProfile | None:
+    return _DETECTED_PROFILES.get(host)
+
+
+def cache_profile(host: str, profile: FirmwareProfile | None) -> None:
+    if profile is None:
+        _DETECTED_PROFILES.pop(host, None)
+    else:
+        _DETECTED_PROFILES[host] = profile
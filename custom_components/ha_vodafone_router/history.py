@@ -0,0 +1,122 @@
+"""Memory-bounded connection history per device.
+
+Only presence transitions are recorded, so each poll costs O(changed devices).
+Timestamps are POSIX seconds.
+"""
+
+from array import array
+
+from .devices import DeviceDelta
+
+HISTORY_MAX_SESSIONS = 64  # closed sessions kept per device
+HISTORY_MAX_DEVICES = 1024  # devices tracked before the stalest are dropped
+
+
+class DeviceHistory:
+    """Ring buffer of closed connect/disconnect intervals for one device."""
+
+    __slots__ = ("_starts", "_ends", "_head", "_count", "connected_since", "_last_seen")
+
+    def __init__(self, capacity: int = HISTORY_MAX_SESSIONS):
+        self._starts = array("d", bytes(8 * capacity))
+        self._ends = array("d", bytes(8 * capacity))
+        self._head = 0
+        self._count = 0
+        self.connected_since: float | None = None
+        self._last_seen: float | None = None
+
+    @property
+    def is_connected(self) -> bool:
+        return self.connected_since is not None
+
+    def connect(self, timestamp: float) -> None:
+        if self.connected_since is None:
+            self.connected_since = timestamp
+
+    def disconnect(self, timestamp: float, last_seen: float | None = None) -> None:
+        if self.connected_since is None:
+            return
+
+        capacity = len(self._starts)
+        self._starts[self._head] = self.connected_since
+        self._ends[self._head] = timestamp
+        self._head = (self._head + 1) % capacity
+        self._count = min(self._count + 1, capacity)
+        self.connected_since = None
+        self._last_seen = last_seen or timestamp
+
+    def last_seen(self, now: float) -> float | None:
+        """Return when the device was last seen; `now` if still connected."""
+        return now if self.is_connected else self._last_seen
+
+    def session_duration(self, now: float) -> float | None:
+        """Return the length of the current session in seconds."""
+        if self.connected_since is None:
+            return None
+        return max(0.0, now - self.connected_since)
+
+    def connected_time(self, since: float, now: float) -> float:
+        """Return the total connected time within [since, now] in seconds."""
+        total = 0.0
+        for start, end in self.sessions():
+            if end > since:
+                total += end - max(start, since)
+        if self.connected_since is not None:
+            total += max(0.0, now - max(self.connected_since, since))
+        return total
+
+    def sessions(self):
+        """Yield closed (start, end) intervals, oldest first."""
+        capacity = len(self._starts)
+        first = (self._head - self._count) % capacity
+        for offset in range(self._count):
+            index = (first + offset) % capacity
+            yield self._starts[index], self._ends[index]
+
+
+class ConnectionHistory:
+    """Connection history of all devices seen by a coordinator."""
+
+    def __init__(
+        self,
+        max_sessions: int = HISTORY_MAX_SESSIONS,
+        max_devices: int = HISTORY_MAX_DEVICES,
+    ):
+        self._max_sessions = max_sessions
+        self._max_devices = max_devices
+        self._devices: dict[str, DeviceHistory] = {}
+        self.updated_at: float | None = None  # time of the last applied poll
+
+    def get(self, mac: str) -> DeviceHistory | None:
+        return self._devices.get(mac)
+
+    def apply(self, delta: DeviceDelta, timestamp: float) -> None:
+        """Record the transitions of one poll."""
+        # Sessions are bounded by the polls that detected the transitions, so
+        # both ends carry the same polling delay. A device that left was last
+        # seen by the previous poll, though.
+        for mac in delta.left:
+            history = self._devices.get(mac)
+            if history is not None:
+                history.disconnect(timestamp, self.updated_at)
+
+        for mac in delta.joined:
+            history = self._devices.get(mac)
+            if history is None:
+                history = self._devices[mac] = DeviceHistory(self._max_sessions)
+            history.connect(timestamp)
+
+        self.updated_at = timestamp
+        if len(self._devices) > self._max_devices:
+            self._evict()
+
+    def _evict(self) -> None:
+        stale = sorted(
+            (
+                (history.last_seen(0.0) or 0.0, mac)
+                for mac, history in self._devices.items()
+                if not history.is_connected
+            )
+        )
+        for _, mac in stale[: len(self._devices) - self._max_devices]:
+            del self._devices[mac]
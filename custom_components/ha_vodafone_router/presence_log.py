@@ -0,0 +1,176 @@
+"""Persistent log of device joins and leaves.
+
+Events are buffered in a bounded queue and written in batches to SQLite by a
+background thread, so the event loop never waits for disk I/O. The table is
+rotated to a fixed number of rows.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_JOIN = "join"
+EVENT_LEAVE = "leave"
+
+PRESENCE_LOG_MAX_ROWS = 200_000
+PRESENCE_LOG_QUEUE_SIZE = 10_000
+PRESENCE_LOG_BATCH_SIZE = 500
+PRESENCE_LOG_FLUSH_INTERVAL = 5.0  # seconds a partial batch may wait
+PRESENCE_LOG_ROTATE_EVERY = 20  # batches between rotations
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS presence ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL NOT NULL, mac TEXT NOT NULL, "
+    "event TEXT NOT NULL, connection TEXT, ip TEXT)",
+    "CREATE INDEX IF NOT EXISTS presence_mac_ts ON presence (mac, ts)",
+)
+
+_STOP = object()
+
+
+class PresenceLog:
+    """Batched SQLite writer and reader for presence transitions."""
+
+    def __init__(
+        self,
+        path: str,
+        max_rows: int = PRESENCE_LOG_MAX_ROWS,
+        queue_size: int = PRESENCE_LOG_QUEUE_SIZE,
+        batch_size: int = PRESENCE_LOG_BATCH_SIZE,
+        flush_interval: float = PRESENCE_LOG_FLUSH_INTERVAL,
+    ):
+        self.path = path
+        self._max_rows = max_rows
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+        self.dropped = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=f"PresenceLog {self.path}", daemon=True
+        )
+        self._thread.start()
+
+    def append(
+        self,
+        timestamp: float,
+        mac: str,
+        event: str,
+        connection: str | None,
+        ip: str | None,
+    ) -> None:
+        """Queue one transition. Drops it if the writer cannot keep up."""
+        try:
+            self._queue.put_nowait((timestamp, mac, event, connection, ip))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                _LOGGER.warning(
+                    "Presence log buffer full, %s events dropped", self.dropped
+                )
+
+    def close(self, timeout: float | None = None) -> None:
+        """Flush pending events and stop the writer thread."""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            _LOGGER.warning("Presence log did not drain, pending events are lost")
+            return
+        self._thread.join(timeout)
+        self._thread = None
+
+    def query(
+        self,
+        mac: str,
+        since: float | None = None,
+        until: float | None = None,
+        limit: int = 100,
+    ) -> list[dict]:
+        """Return the newest transitions of a device, newest first."""
+        sql = "SELECT ts, event, connection, ip FROM presence WHERE mac = ?"
+        params: list = [mac]
+        if since is not None:
+            sql += " AND ts >= ?"
+            params.append(since)
+        if until is not None:
+            sql += " AND ts <= ?"
+            params.append(until)
+        sql += " ORDER BY ts DESC LIMIT ?"
+        params.append(limit)
+
+        connection = self._connect()
+        try:
+            rows = connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
+        return [
+            {"timestamp": ts, "event": event, "connection": conn, "ip": ip}
+            for ts, event, conn, ip in rows
+        ]
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=10)
+        connection.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            connection.execute(statement)
+        return connection
+
+    def _run(self) -> None:
+        connection = self._connect()
+        batches = 0
+        try:
+            while True:
+                batch, stop = self._next_batch()
+                if batch:
+                    with connection:
+                        connection.executemany(
+                            "INSERT INTO presence (ts, mac, event, connection, ip) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            batch,
+                        )
+                    batches += 1
+                    if batches % PRESENCE_LOG_ROTATE_EVERY == 0:
+                        self._rotate(connection)
+                if stop:
+                    return
+        except sqlite3.Error as err:
+            _LOGGER.error("Presence log writer stopped: %s", err)
+        finally:
+            connection.close()
+
+    def _next_batch(self) -> tuple[list, bool]:
+        """Block for the first event, then fill the batch until the flush interval."""
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        flush_at = time.monotonic() + self._flush_interval
+        while len(batch) < self._batch_size:
+            try:
+                item = self._queue.get(timeout=max(0.0, flush_at - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _rotate(self, connection: sqlite3.Connection) -> None:
+        with connection:
+            deleted = connection.execute(
+                "DELETE FROM presence WHERE id <= (SELECT MAX(id) FROM presence) - ?",
+                (self._max_rows,),
+            ).rowcount
+        if deleted:
+            _LOGGER.debug("Rotated %s old presence log entries", deleted)
@@ -0,0 +1,173 @@
+"""On-demand cProfile and tracemalloc capture of coordinator poll cycles."""
+
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import tracemalloc
+from datetime import datetime
+
+_LOGGER = logging.getLogger(__name__)
+
+REPORT_TOP_FUNCTIONS = 60
+REPORT_TOP_ALLOCATIONS = 25
+
+
+# cProfile captures of all profilers in the process are taken one at a time.
+# On Python 3.12+ only one profiler may be active per process anyway, and on
+# older versions overlapping captures would count the same work twice.
+_CAPTURE_LOCK = threading.Lock()
+
+# Profilers of several hosts can overlap. Allocation tracing is started by the
+# first of them and stopped when the last one finishes, unless it was already
+# running before, e.g. for Home Assistant's own profiler.
+_TRACING_LOCK = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+
+
+def _acquire_tracing() -> None:
+    global _tracing_users, _started_tracing
+    with _TRACING_LOCK:
+        if _tracing_users == 0:
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+        _tracing_users += 1
+
+
+def _release_tracing() -> None:
+    global _tracing_users, _started_tracing
+    with _TRACING_LOCK:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+class PollProfiler:
+    """Collect call statistics across threads for a fixed number of cycles.
+
+    Each profiled call is captured separately and merged into the shared
+    statistics, so executor jobs (login, fetch, parsing) and event loop work
+    (entity dispatch) end up in one report. A call overlapping another
+    capture, ours or a different tool's such as Home Assistant's profiler,
+    runs unprofiled and is counted as skipped.
+    """
+
+    def __init__(self, cycles: int):
+        self.remaining = cycles
+        self.cycles = cycles
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._stats: pstats.Stats | None = None
+        self._stopped = False
+        _acquire_tracing()
+
+    def run(self, func, *args):
+        """Call func under a profiler and merge its statistics."""
+        profile = self._start_capture()
+        if profile is None:
+            return func(*args)
+
+        try:
+            return func(*args)
+        finally:
+            profile.disable()
+            _CAPTURE_LOCK.release()
+            self._merge(profile)
+
+    def _start_capture(self) -> cProfile.Profile | None:
+        if not _CAPTURE_LOCK.acquire(blocking=False):
+            self._skip()
+            return None
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiling tool is active in this process
+            _CAPTURE_LOCK.release()
+            self._skip()
+            return None
+        return profile
+
+    def _skip(self) -> None:
+        with self._lock:
+            self.skipped += 1
+
+    def _merge(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            try:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+            except Exception as err:
+                # An empty capture cannot be turned into statistics
+                _LOGGER.debug("Discarding profile capture: %s", err)
+
+    def cycle_done(self) -> bool:
+        """Count a finished cycle. Return True once all cycles are captured."""
+        self.remaining -= 1
+        return self.remaining <= 0
+
+    def stop(self) -> tracemalloc.Snapshot | None:
+        """Release allocation tracing and return the final snapshot.
+
+        Only the first call takes a snapshot. None is returned if tracing was
+        switched off by someone else in the meantime.
+        """
+        if self._stopped:
+            return None
+        self._stopped = True
+        try:
+            if not tracemalloc.is_tracing():
+                _LOGGER.warning("Allocation tracing was stopped during profiling")
+                return None
+            return tracemalloc.take_snapshot()
+        finally:
+            _release_tracing()
+
+    def write_report(
+        self, snapshot: tracemalloc.Snapshot | None, base_path: str
+    ) -> tuple[str, str | None]:
+        """Write the sorted call report and the allocation snapshot."""
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = f"{base_path}_{stamp}.txt"
+        snapshot_path = f"{base_path}_{stamp}.tracemalloc"
+
+        stream = io.StringIO()
+        stream.write(
+            f"Profiled poll cycles: {self.cycles - max(self.remaining, 0)}\n"
+            f"Calls skipped while another capture was active: {self.skipped}\n\n"
+        )
+        with self._lock:
+            if self._stats is None:
+                stream.write("No calls were profiled.\n")
+            else:
+                self._stats.stream = stream
+                self._stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+                    REPORT_TOP_FUNCTIONS
+                )
+
+        stream.write("\nTop allocations by line:\n")
+        if snapshot is None:
+            stream.write("No allocation snapshot was taken.\n")
+            snapshot_path = None
+        else:
+            for stat in snapshot.statistics("lineno")[:REPORT_TOP_ALLOCATIONS]:
+                stream.write(f"{stat}\n")
+
+        with open(report_path, "w", encoding="utf-8") as report:
+            report.write(stream.getvalue())
+        if snapshot is not None:
+            snapshot.dump(snapshot_path)
+
+        _LOGGER.info(
+            "Profiling report written to %s, allocation snapshot to %s",
+            report_path,
+            snapshot_path,
+        )
+        return report_path, snapshot_path
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import logging
+
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import Platform, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import (
+    ATTR_CONNECTED_TODAY,
+    ATTR_SESSION_DURATION,
+    CONNECTION_LAN,
+    CONNECTION_WLAN,
+    DEVICE_PROPERTY_HOSTNAME,
+    DEVICE_PROPERTY_MAC_ADDRESS,
+    DEVICE_PROPERTY_NAME,
+    DOMAIN,
+)
+from .coordinator import VodafoneDeviceView
+from .devices import PresenceCounter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Vodafone device count sensors and per-device connection times."""
+    _LOGGER.info("Setting up Vodafone aggregate sensors for entry: %s", entry.entry_id)
+
+    coordinator: VodafoneDeviceView = hass.data[DOMAIN][entry.entry_id]
+    counts = VodafoneDeviceCounts(coordinator)
+
+    entities: list[VodafoneDeviceCountSensor] = [
+        VodafoneDeviceCountSensor(
+            counts, entry, "connected", "Connected devices", lambda c: c.total
+        ),
+        VodafoneDeviceCountSensor(
+            counts,
+            entry,
+            "lan",
+            "LAN devices",
+            lambda c: c.by_connection[CONNECTION_LAN],
+        ),
+        VodafoneDeviceCountSensor(
+            counts,
+            entry,
+            "wlan",
+            "WLAN devices",
+            lambda c: c.by_connection[CONNECTION_WLAN],
+        ),
+    ]
+    for group in coordinator.mac_groups:
+        entities.append(
+            VodafoneDeviceCountSensor(
+                counts,
+                entry,
+                f"group_{group}",
+                f"{group} devices",
+                lambda c, group=group: c.by_group.get(group, 0),
+            )
+        )
+
+    _LOGGER.info("Created %s aggregate sensor entities", len(entities))
+    async_add_entities(entities)
+
+    @callback
+    def _async_add_new_devices() -> None:
+        """Create connection time sensors for devices that do not have them yet."""
+        sensors = []
+        for device in coordinator.untracked_devices(Platform.SENSOR):
+            sensors.append(
+                VodafoneDeviceTimeSensor(
+                    coordinator,
+                    entry,
+                    device,
+                    ATTR_SESSION_DURATION,
+                    "Session duration",
+                    SensorStateClass.MEASUREMENT,
+                )
+            )
+            sensors.append(
+                VodafoneDeviceTimeSensor(
+                    coordinator,
+                    entry,
+                    device,
+                    ATTR_CONNECTED_TODAY,
+                    "Connected today",
+                    SensorStateClass.TOTAL_INCREASING,
+                )
+            )
+
+        if sensors:
+            _LOGGER.info("Created %s connection time sensor entities", len(sensors))
+            async_add_entities(sensors)
+
+    _async_add_new_devices()
+    # Picks up devices newly included by a changed MAC filter
+    coordinator.async_add_platform_listener(Platform.SENSOR, _async_add_new_devices)
+
+
+class VodafoneDeviceCounts:
+    """Entry-wide device counts kept in sync with the shared coordinator.
+
+    The counts follow the coordinator's per-poll deltas, so a poll costs
+    O(changed devices) regardless of how many devices are connected. They
+    are recounted from the full table only after a filter change or when a
+    delta was missed.
+    """
+
+    def __init__(self, coordinator: VodafoneDeviceView):
+        self.coordinator = coordinator
+        self.counter: PresenceCounter | None = None
+        self._serial: int | None = None
+        self._options_version: int | None = None
+
+    @callback
+    def async_sync(self) -> PresenceCounter:
+        view = self.coordinator
+        host = view.coordinator
+        if (
+            self.counter is None
+            or self._options_version != view.options_version
+            or host.delta_serial not in (self._serial, self._serial + 1)
+        ):
+            _LOGGER.debug("Recounting connected devices of %s", host.host)
+            self.counter = PresenceCounter(view.includes, view.mac_groups)
+            self.counter.reset(host.devices)
+            self._options_version = view.options_version
+        elif host.delta_serial != self._serial:
+            self.counter.apply(host.last_delta)
+
+        self._serial = host.delta_serial
+        return self.counter
+
+
+class VodafoneDeviceCountSensor(SensorEntity):
+    """Number of connected devices in one aggregate."""
+
+    _attr_should_poll = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "devices"
+
+    def __init__(
+        self,
+        counts: VodafoneDeviceCounts,
+        entry: ConfigEntry,
+        key: str,
+        name: str,
+        value_fn,
+    ) -> None:
+        self.counts = counts
+        self.coordinator = counts.coordinator
+        self._value_fn = value_fn
+        self._attr_name = name
+        self._attr_unique_id = f"vodafone_{entry.entry_id}_{key}_count"
+        self._attr_native_value = value_fn(counts.async_sync())
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        value = self._value_fn(self.counts.async_sync())
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
+
+    async def async_update(self) -> None:
+        await self.coordinator.async_request_refresh()
+
+    async def async_added_to_hass(self) -> None:
+        """Register for coordinator updates."""
+        _LOGGER.debug("Adding aggregate sensor %s to Home Assistant", self._attr_name)
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
+        )
+
+
+class VodafoneDeviceTimeSensor(SensorEntity):
+    """Connection time of one device, from the coordinator's history.
+
+    These values change on every poll while the device is connected, so
+    the sensors are disabled by default and only cost recorder writes for
+    the devices a user enables them for.
+    """
+
+    _attr_should_poll = False
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: VodafoneDeviceView,
+        entry: ConfigEntry,
+        device: dict[str, Any],
+        key: str,
+        name: str,
+        state_class: SensorStateClass,
+    ) -> None:
+        self.coordinator = coordinator
+        self.mac: str = device.get(DEVICE_PROPERTY_MAC_ADDRESS)
+        self._key = key
+        device_name = (
+            device.get(DEVICE_PROPERTY_HOSTNAME)
+            or device.get(DEVICE_PROPERTY_NAME)
+            or self.mac
+        )
+        self._attr_name = f"{device_name} {name}"
+        # Entries sharing a host each get their own sensors
+        self._attr_unique_id = (
+            f"vodafone_{entry.entry_id}_{self.mac.replace(':', '')}_{key}"
+        )
+        self._attr_state_class = state_class
+        self._attr_native_value = self._current_value()
+
+    def _current_value(self) -> int | None:
+        session, today = self.coordinator.device_connected_time(self.mac)
+        return session if self._key == ATTR_SESSION_DURATION else today
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        if not self.coordinator.includes(self.mac):
+            self.coordinator.async_remove_entity(Platform.SENSOR, self)
+            return
+        value = self._current_value()
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
+
+    async def async_update(self) -> None:
+        await self.coordinator.async_request_refresh()
+
+    async def async_added_to_hass(self) -> None:
+        """Register for coordinator updates."""
+        _LOGGER.debug(
+            "Adding connection time sensor %s to Home Assistant", self._attr_name
+        )
+        self.async_on_remove(
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
+        )
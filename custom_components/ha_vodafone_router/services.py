@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import logging
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_CONNECTION,
+    ATTR_CYCLES,
+    ATTR_HOSTNAME_PREFIX,
+    ATTR_LIMIT,
+    ATTR_MAC,
+    ATTR_MAX_AGE,
+    ATTR_SINCE,
+    ATTR_UNTIL,
+    CONNECTION_LAN,
+    CONNECTION_WLAN,
+    DATA_HOSTS,
+    DEFAULT_HISTORY_LIMIT,
+    DEFAULT_PROFILE_CYCLES,
+    DEVICE_PROPERTY_CONNECTION,
+    DEVICE_PROPERTY_HOSTNAME,
+    DOMAIN,
+    SERVICE_GET_DEVICES,
+    SERVICE_GET_HISTORY,
+    SERVICE_PROFILE,
+)
+
+from .coordinator import VodafoneDeviceCoordinator, VodafoneDeviceView
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_PROFILE_CYCLES): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_MAC): vol.All(
+            cv.string, lambda mac: mac.strip().lower().replace("-", ":")
+        ),
+        vol.Optional(ATTR_SINCE): cv.datetime,
+        vol.Optional(ATTR_UNTIL): cv.datetime,
+        vol.Optional(ATTR_LIMIT, default=DEFAULT_HISTORY_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=10000)
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+GET_DEVICES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_MAC): vol.All(
+            cv.ensure_list,
+            [vol.All(cv.string, lambda mac: mac.strip().lower().replace("-", ":"))],
+        ),
+        vol.Optional(ATTR_HOSTNAME_PREFIX): cv.string,
+        vol.Optional(ATTR_CONNECTION): vol.In([CONNECTION_LAN, CONNECTION_WLAN]),
+        vol.Optional(ATTR_MAX_AGE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+
+def _as_timestamp(value) -> float | None:
+    if value is None:
+        return None
+    return dt_util.as_utc(value).timestamp()
+
+
+def _get_coordinators(
+    hass: HomeAssistant, entry_id: str | None
+) -> list[VodafoneDeviceCoordinator]:
+    """Return the coordinator of an entry, or all coordinators if none is given."""
+    if entry_id is not None:
+        return [_get_view(hass, entry_id).coordinator]
+
+    coordinators = list(hass.data.get(DOMAIN, {}).get(DATA_HOSTS, {}).values())
+    if not coordinators:
+        raise ServiceValidationError("No Vodafone Station is loaded")
+    return coordinators
+
+
+def _get_view(hass: HomeAssistant, entry_id: str) -> VodafoneDeviceView:
+    view = hass.data.get(DOMAIN, {}).get(entry_id)
+    if not isinstance(view, VodafoneDeviceView):
+        raise ServiceValidationError(f"Config entry {entry_id} is not loaded")
+    return view
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_profile(call: ServiceCall) -> None:
+        for coordinator in _get_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+            await coordinator.async_start_profiling(call.data[ATTR_CYCLES])
+
+    async def async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return presence transitions of a device from the presence log."""
+        events = []
+        for coordinator in _get_coordinators(hass, call.data.get(ATTR_CONFIG_ENTRY_ID)):
+            if coordinator.presence_log is None:
+                continue
+            rows = await hass.async_add_executor_job(
+                coordinator.presence_log.query,
+                call.data[ATTR_MAC],
+                _as_timestamp(call.data.get(ATTR_SINCE)),
+                _as_timestamp(call.data.get(ATTR_UNTIL)),
+                call.data[ATTR_LIMIT],
+            )
+            events.extend({**row, "host": coordinator.host} for row in rows)
+
+        events.sort(key=lambda row: row["timestamp"], reverse=True)
+        return {
+            ATTR_MAC: call.data[ATTR_MAC],
+            "events": [
+                {
+                    **row,
+                    "timestamp": dt_util.utc_from_timestamp(
+                        row["timestamp"]
+                    ).isoformat(),
+                }
+                for row in events[: call.data[ATTR_LIMIT]]
+            ],
+        }
+
+    async def async_get_devices(call: ServiceCall) -> ServiceResponse:
+        """Return the cached device table, fetching only if it is too old."""
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        view = _get_view(hass, entry_id) if entry_id is not None else None
+        macs = set(call.data.get(ATTR_MAC, ()))
+        prefix = call.data.get(ATTR_HOSTNAME_PREFIX, "").lower()
+        connection = call.data.get(ATTR_CONNECTION)
+        max_age = call.data.get(ATTR_MAX_AGE)
+
+        devices = []
+        data_age = None
+        for coordinator in _get_coordinators(hass, entry_id):
+            if max_age is not None:
+                await coordinator.async_ensure_fresh(max_age)
+            age = coordinator.data_age
+            if age is not None:
+                data_age = age if data_age is None else max(data_age, age)
+
+            for mac, record in coordinator.devices.items():
+                if view is not None and not view.includes(mac):
+                    continue
+                if macs and mac not in macs:
+                    continue
+                if connection and record.get(DEVICE_PROPERTY_CONNECTION) != connection:
+                    continue
+                if prefix and not (
+                    record.get(DEVICE_PROPERTY_HOSTNAME) or ""
+                ).lower().startswith(prefix):
+                    continue
+                devices.append({**record, "host": coordinator.host})
+
+        return {
+            "devices": devices,
+            "data_age": round(data_age, 1) if data_age is not None else None,
+        }
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_DEVICES,
+        async_get_devices,
+        schema=GET_DEVICES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    _LOGGER.debug("Registered services for %s", DOMAIN)
@@ -0,0 +1,110 @@
+"""HTTP session for talking to one router, with optional pinned HTTPS.
+
+Imported by VodafoneBox on first use only, so loading the integration does
+not pull in requests and urllib3.
+"""
+
+import logging
+import ssl
+import warnings
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InsecureRequestWarning
+
+from .vodafone_box import TransportOptions
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _SessionSavingSocket(ssl.SSLSocket):
+    def close(self):
+        # TLS 1.3 tickets arrive after the handshake, so the session is only
+        # worth keeping once the connection has been used.
+        session = self.session
+        if session is not None:
+            self.context.tls_session = session
+        super().close()
+
+
+class ResumingSSLContext(ssl.SSLContext):
+    """SSL context that offers the last TLS session on every new connection.
+
+    urllib3 has no notion of session resumption, so a connection dropped by
+    the router would cost a full handshake. Sockets hand their session back
+    to the context when they are closed, and the next handshake resumes it.
+    """
+
+    sslsocket_class = _SessionSavingSocket
+    tls_session: ssl.SSLSession | None = None
+    handshakes = 0
+    resumed = 0
+
+    def wrap_socket(self, sock, *args, **kwargs):
+        if self.tls_session is not None:
+            kwargs.setdefault("session", self.tls_session)
+        try:
+            ssl_sock = super().wrap_socket(sock, *args, **kwargs)
+        except ssl.SSLError:
+            # A session the server no longer accepts must not break every reconnect
+            self.tls_session = None
+            raise
+        self.handshakes += 1
+        if ssl_sock.session_reused:
+            self.resumed += 1
+        return ssl_sock
+
+
+class RouterAdapter(HTTPAdapter):
+    """Keep-alive connection pool for a single router with TLS pinning."""
+
+    def __init__(self, ssl_context: ResumingSSLContext, fingerprint: str | None):
+        self.ssl_context = ssl_context
+        self.fingerprint = fingerprint
+        # All requests go to one host and are issued one at a time
+        super().__init__(pool_connections=1, pool_maxsize=1, max_retries=0)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self.ssl_context
+        if self.fingerprint:
+            kwargs["assert_fingerprint"] = self.fingerprint
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("verify", True) or self.fingerprint:
+            return super().send(request, **kwargs)
+        # Verification was switched off on purpose and logged once at setup,
+        # urllib3 would otherwise warn on every single request.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", InsecureRequestWarning)
+            return super().send(request, **kwargs)
+
+
+def create_session(
+    base_url: str, transport: TransportOptions
+) -> tuple[requests.Session, ResumingSSLContext | None]:
+    """Return a session for the router and its TLS context in HTTPS mode."""
+    session = requests.Session()
+    tls_context = None
+    if transport.https:
+        tls_context = ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        # urllib3 matches the hostname itself and sets the verify mode
+        tls_context.check_hostname = False
+        session.mount(f"{base_url}/", RouterAdapter(tls_context, transport.fingerprint))
+        # A pinned certificate replaces CA validation
+        session.verify = transport.verify_ssl and not transport.fingerprint
+        if not transport.verify_ssl and not transport.fingerprint:
+            _LOGGER.warning(
+                "The TLS certificate of %s is not verified, pin its fingerprint "
+                "to protect the router password",
+                base_url,
+            )
+    session.headers.update(
+        {
+            "X-Requested-With": "XMLHttpRequest",
+            "Referer": f"{base_url}/?overview",
+            "Origin": base_url,
+            "User-Agent": "Mozilla/5.0",
+        }
+    )
+    return session, tls_context
@@ -1,31 +1,93 @@
 import random
 import json
-import requests
 import re
 import logging
+import socket
+import threading
 import time
-
-from .sjcl import SJCL
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+from .const import (
+    OPTION_CERT_FINGERPRINT,
+    OPTION_USE_HTTPS,
+    OPTION_VERIFY_SSL,
+    ROUTER_PROPERTY_LAN_DEVICES,
+    ROUTER_PROPERTY_WLAN_DEVICES,
+)
+from .firmware import FirmwareProfile, cache_profile, detect_profile, get_cached_profile
 
 _LOGGER = logging.getLogger(__name__)
 
+# Per-endpoint timeouts are derived from an EWMA of observed latency so a slow
+# or dead router is detected quickly without cutting off a healthy one.
+DEFAULT_TIMEOUT = 10.0
+MIN_TIMEOUT = 2.0
+LATENCY_EWMA_ALPHA = 0.3
+TIMEOUT_LATENCY_FACTOR = 4.0
+PROBE_TIMEOUT = 2.0
+
+# Keys used for latency tracking of requests outside /php/
+ENDPOINT_INDEX = "index"
+LOGIN_ENDPOINTS = (
+    ENDPOINT_INDEX,
+    ENDPOINT_INDEX,
+    "ajaxSet_Password.php",
+    "ajaxSet_Session.php",
+)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request cannot finish before the caller's deadline."""
+
+
+class RouterUnreachable(ConnectionError):
+    """Raised when the router does not answer at the network level."""
+
+
+class RequestTimeout(TimeoutError):
+    """Raised when the router accepted a request but did not answer in time."""
+
+
+class CertificateMismatch(ConnectionError):
+    """Raised when the router's TLS certificate fails verification or pinning."""
+
+
+class TransportOptions(NamedTuple):
+    """How VodafoneBox talks to the router."""
+
+    https: bool = False
+    verify_ssl: bool = True
+    # SHA-256 (or SHA-1) fingerprint of the router certificate. When set, the
+    # certificate is pinned instead of validated against the CA store, which
+    # is what self-signed router certificates need.
+    fingerprint: str | None = None
+
+    @classmethod
+    def from_options(cls, options: Mapping) -> "TransportOptions":
+        fingerprint = options.get(OPTION_CERT_FINGERPRINT, "").replace(":", "") or None
+        return cls(
+            # Pinning only means something over HTTPS, so a fingerprint implies it
+            https=options.get(OPTION_USE_HTTPS, False) or fingerprint is not None,
+            verify_ssl=options.get(OPTION_VERIFY_SSL, True),
+            fingerprint=fingerprint,
+        )
+
 
 class VodafoneBox:
-    def __init__(self, host: str):
+    def __init__(self, host: str, transport: TransportOptions = TransportOptions()):
         _LOGGER.debug("Initializing VodafoneBox for host: %s", host)
         self.host = host
-        self.base_url = f"http://{host}"
+        self.transport = transport
+        self.base_url = f"{'https' if transport.https else 'http'}://{host}"
         _LOGGER.debug("Base URL set to: %s", self.base_url)
 
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "X-Requested-With": "XMLHttpRequest",
-                "Referer": f"{self.base_url}/?overview",
-                "Origin": self.base_url,
-                "User-Agent": "Mozilla/5.0",
-            }
-        )
+        # Created on the first request, see the session property
+        self._session = None
+        self.tls_context = None
 
         self.session_id = None
         self.nonce = None
@@ -33,6 +95,153 @@ class VodafoneBox:
         self.iv = None
         self.salt = None
         self.key = None
+        self._latency: dict[str, float] = {}
+
+        # Session id, nonces and the cookie jar are shared by all operations,
+        # so only one of them may talk to the router at a time.
+        self._lock = threading.Lock()
+        self._inflight_lock = threading.Lock()
+        self._inflight: dict[tuple, Future] = {}
+
+    @property
+    def session(self):
+        """The requests session, imported and created on first use."""
+        if self._session is None:
+            from .transport import create_session
+
+            self._session, self.tls_context = create_session(
+                self.base_url, self.transport
+            )
+        return self._session
+
+    def _run_exclusive(self, key: tuple, deadline: float | None, func: Callable, *args):
+        """Run a stateful operation alone, or join an identical one in flight.
+
+        A caller asking for the same operation while it is running waits for
+        and shares its result instead of queueing a duplicate request.
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            _LOGGER.debug("Joining in-flight %s", key[0])
+            try:
+                return future.result(self._remaining(deadline, key[0]))
+            except FutureTimeoutError as err:
+                raise DeadlineExceeded(
+                    f"Deadline exceeded waiting for {key[0]}"
+                ) from err
+
+        try:
+            timeout = self._remaining(deadline, key[0])
+            if not self._lock.acquire(timeout=-1 if timeout is None else timeout):
+                raise DeadlineExceeded(f"Deadline exceeded queueing {key[0]}")
+            try:
+                result = func(*args)
+            finally:
+                self._lock.release()
+        except BaseException as err:
+            future.set_exception(err)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    @staticmethod
+    def _remaining(deadline: float | None, operation: str) -> float | None:
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded before {operation}")
+        return remaining
+
+    def _record_latency(self, endpoint: str, seconds: float):
+        previous = self._latency.get(endpoint)
+        if previous is None:
+            self._latency[endpoint] = seconds
+        else:
+            self._latency[endpoint] = (
+                LATENCY_EWMA_ALPHA * seconds + (1 - LATENCY_EWMA_ALPHA) * previous
+            )
+
+    def expected_latency(self, *endpoints: str) -> float:
+        """Return the expected duration of a sequence of requests in seconds."""
+        return sum(self._latency.get(endpoint, 0.0) for endpoint in endpoints)
+
+    def _timeout_for(
+        self, endpoint: str, deadline: float | None = None
+    ) -> tuple[float, bool]:
+        """Return the timeout for a request and whether the deadline shortened it."""
+        latency = self._latency.get(endpoint)
+        if latency is None:
+            timeout = DEFAULT_TIMEOUT
+        else:
+            timeout = min(
+                DEFAULT_TIMEOUT, max(MIN_TIMEOUT, latency * TIMEOUT_LATENCY_FACTOR)
+            )
+
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded(
+                    f"Deadline exceeded before requesting {endpoint}"
+                )
+            if remaining < timeout:
+                return remaining, True
+
+        return timeout, False
+
+    def _request(
+        self, method: str, url: str, endpoint: str, deadline: float | None, **kwargs
+    ):
+        import requests
+
+        timeout, capped = self._timeout_for(endpoint, deadline)
+        start = time.monotonic()
+        try:
+            # Passed explicitly, REQUESTS_CA_BUNDLE would override session.verify
+            response = self.session.request(
+                method, url, timeout=timeout, verify=self.session.verify, **kwargs
+            )
+        except requests.exceptions.SSLError as err:
+            raise CertificateMismatch(
+                f"TLS verification of {self.host} failed: {err}"
+            ) from err
+        except requests.Timeout as err:
+            # Feed the timeout back so the next attempt does not expect a fast reply
+            self._record_latency(endpoint, timeout)
+            if capped:
+                raise DeadlineExceeded(
+                    f"Deadline exceeded requesting {endpoint}"
+                ) from err
+            if isinstance(err, requests.ConnectTimeout):
+                raise RouterUnreachable(
+                    f"Timeout connecting to {self.host}: {err}"
+                ) from err
+            # The router accepted the request, it is slow rather than gone
+            raise RequestTimeout(f"Timeout requesting {endpoint}: {err}") from err
+        except requests.ConnectionError as err:
+            raise RouterUnreachable(f"Cannot connect to {self.host}: {err}") from err
+        self._record_latency(endpoint, time.monotonic() - start)
+        return response
+
+    def probe(self, timeout: float = PROBE_TIMEOUT) -> bool:
+        """Check with a plain TCP connect whether the router's web server is up."""
+        url = urlsplit(self.base_url)
+        port = url.port or (443 if url.scheme == "https" else 80)
+        try:
+            with socket.create_connection((url.hostname, port), timeout=timeout):
+                return True
+        except OSError as err:
+            _LOGGER.debug("Liveness probe of %s failed: %s", self.host, err)
+            return False
 
     def _headers(self):
         return {
@@ -40,7 +249,9 @@ class VodafoneBox:
             "csrfNonce": self.csrf_nonce,
         }
 
-    def _get(self, endpoint: str, params: str | None = None):
+    def _get(
+        self, endpoint: str, params: str | None = None, deadline: float | None = None
+    ):
         url = f"{self.base_url}/php/{endpoint}?_n={self.nonce}"
         if params:
             url += f"&{params}"
@@ -48,7 +259,9 @@ class VodafoneBox:
         _LOGGER.debug(
             "Making GET request to: %s with headers: %s", url, self._headers()
         )
-        response = self.session.get(url, headers=self._headers(), timeout=10)
+        response = self._request(
+            "GET", url, endpoint, deadline, headers=self._headers()
+        )
         _LOGGER.debug(
             "GET response status: %s, content length: %s",
             response.status_code,
@@ -56,7 +269,7 @@ class VodafoneBox:
         )
         return response
 
-    def _post(self, endpoint: str, data=None):
+    def _post(self, endpoint: str, data=None, deadline: float | None = None):
         url = f"{self.base_url}/php/{endpoint}?_n={self.nonce}"
         _LOGGER.debug(
             "Making POST request to: %s with data: %s and headers: %s",
@@ -64,8 +277,8 @@ class VodafoneBox:
             data,
             self._headers(),
         )
-        response = self.session.post(
-            url, json=data, headers=self._headers(), timeout=10
+        response = self._request(
+            "POST", url, endpoint, deadline, json=data, headers=self._headers()
         )
         _LOGGER.debug(
             "POST response status: %s, content length: %s",
@@ -74,16 +287,16 @@ class VodafoneBox:
         )
         return response
 
-    def _init_crypto_values(self):
+    def _init_crypto_values(self, deadline: float | None = None):
         # First, make an initial request to establish session properly
-        initial_resp = self.session.get(self.base_url, timeout=10)
+        initial_resp = self._request("GET", self.base_url, ENDPOINT_INDEX, deadline)
 
         # Get session ID from the initial response
         if initial_resp.cookies.get("PHPSESSID"):
             self.session_id = initial_resp.cookies.get("PHPSESSID")
 
         # Now make a second request with the session established
-        resp = self.session.get(self.base_url, timeout=10)
+        resp = self._request("GET", self.base_url, ENDPOINT_INDEX, deadline)
 
         # Update session ID if it changed
         if resp.cookies.get("PHPSESSID"):
@@ -109,16 +322,29 @@ class VodafoneBox:
         self.salt = salt_match.group(1)
         self.nonce = str(random.random())[2:7]
 
-        print(f"Extracted IV: '{self.iv}', Salt: '{self.salt}'")
+        _LOGGER.debug("Extracted IV: '%s', Salt: '%s'", self.iv, self.salt)
+
+    def login(self, username: str, password: str, deadline: float | None = None):
+        self._run_exclusive(
+            ("login", username, password),
+            deadline,
+            self._login,
+            username,
+            password,
+            deadline,
+        )
+
+    def _login(self, username: str, password: str, deadline: float | None):
+        # The crypto stack is only needed here, so it is not loaded with HA
+        from .sjcl import SJCL
 
-    def login(self, username: str, password: str):
         _LOGGER.info("Starting login process for user: %s", username)
         self.session.cookies.clear()
         self.session_id = None
         self.csrf_nonce = ""
 
         _LOGGER.debug("Initializing crypto values")
-        self._init_crypto_values()
+        self._init_crypto_values(deadline)
 
         js_data = json.dumps(
             {
@@ -158,7 +384,7 @@ class VodafoneBox:
         }
         _LOGGER.debug("Sending login request with payload for user: %s", username)
 
-        resp = self._post("ajaxSet_Password.php", payload)
+        resp = self._post("ajaxSet_Password.php", payload, deadline)
         _LOGGER.debug(
             "Login response status: %s, content: %s", resp.status_code, resp.text[:200]
         )
@@ -205,11 +431,11 @@ class VodafoneBox:
             _LOGGER.debug("CSRF nonce decrypted: %s", self.csrf_nonce[:10] + "...")
 
             _LOGGER.debug("Setting session")
-            self._set_session()
+            self._set_session(deadline)
 
-    def _set_session(self):
+    def _set_session(self, deadline: float | None = None):
         _LOGGER.debug("Setting session with CSRF nonce")
-        resp = self._post("ajaxSet_Session.php")
+        resp = self._post("ajaxSet_Session.php", deadline=deadline)
         login_status = resp.json().get("LoginStatus", "")
         _LOGGER.debug("Session response: %s", resp.json())
 
@@ -220,9 +446,12 @@ class VodafoneBox:
         else:
             _LOGGER.info("Session successfully established")
 
-    def logout(self):
+    def logout(self, deadline: float | None = None):
+        self._run_exclusive(("logout",), deadline, self._logout, deadline)
+
+    def _logout(self, deadline: float | None):
         _LOGGER.info("Starting logout process")
-        resp = self._post("logout.php")
+        resp = self._post("logout.php", deadline=deadline)
         _LOGGER.debug("Logout response status: %s", resp.status_code)
 
         if resp.status_code == 200:
@@ -230,49 +459,130 @@ class VodafoneBox:
         else:
             _LOGGER.warning("Logout may have failed with status: %s", resp.status_code)
 
-    def get_connected_devices(self):
+    def close(self):
+        """Close all pooled connections to the router."""
+        if self._session is not None:
+            self._session.close()
+
+    def get_connected_devices(self, deadline: float | None = None):
+        """Return the raw device tables.
+
+        Callers joining an in-flight fetch receive the same dictionary.
+        """
+        return self._run_exclusive(
+            ("devices",), deadline, self._get_connected_devices, deadline
+        )
+
+    def _get_connected_devices(self, deadline: float | None):
         max_retries = 3
         retry_delay_in_seconds = 2
 
         for attempt in range(max_retries):
-            _LOGGER.debug("Fetching connected devices (Attempt %s/%s)", attempt + 1, max_retries)
-            resp = self._get("overview_data.php")
+            _LOGGER.debug(
+                "Fetching connected devices (Attempt %s/%s)", attempt + 1, max_retries
+            )
+            resp = self._get("overview_data.php", deadline=deadline)
             text = resp.text
 
             _LOGGER.debug("Overview data received: %s", text)
-            
-            if "PAGE_OVERVIEW_SESSION_LOST_POPUP_TEXT" in text or resp.status_code == 400:
-                _LOGGER.warning("Vodafone Station session expired. Re-authentication required.")
+
+            if (
+                "PAGE_OVERVIEW_SESSION_LOST_POPUP_TEXT" in text
+                or resp.status_code == 400
+            ):
+                _LOGGER.warning(
+                    "Vodafone Station session expired. Re-authentication required."
+                )
                 raise Exception("Session lost")
 
-            lan_devices = self._safe_extract(text, "json_lanAttachedDevice")
-            wireless_devices = self._safe_extract(text, "json_primaryWlanAttachedDevice")
+            devices = self._parse_devices(text)
 
-            if lan_devices is not None and wireless_devices is not None:
+            if devices is not None:
+                lan_devices = devices[ROUTER_PROPERTY_LAN_DEVICES]
+                wireless_devices = devices[ROUTER_PROPERTY_WLAN_DEVICES]
                 total_found = len(lan_devices) + len(wireless_devices)
-                
+
                 if total_found > 0:
-                    _LOGGER.info("Found %s LAN and %s WLAN devices", len(lan_devices), len(wireless_devices))
-                    return {
-                        "lanDevices": lan_devices,
-                        "wlanDevices": wireless_devices,
-                    }
-                
+                    _LOGGER.info(
+                        "Found %s LAN and %s WLAN devices",
+                        len(lan_devices),
+                        len(wireless_devices),
+                    )
+                    return devices
+
                 if attempt < max_retries - 1:
+                    if deadline is not None and (
+                        time.monotonic()
+                        + retry_delay_in_seconds
+                        + self.expected_latency("overview_data.php")
+                        > deadline
+                    ):
+                        raise DeadlineExceeded(
+                            "Router reported 0 devices and no time is left to retry"
+                        )
                     _LOGGER.debug(
-                        "Router reported 0 devices (stale data). Retrying in %ss...", 
-                        retry_delay_in_seconds
+                        "Router reported 0 devices (stale data). Retrying in %ss...",
+                        retry_delay_in_seconds,
                     )
                     time.sleep(retry_delay_in_seconds)
                     continue
                 else:
-                    _LOGGER.warning("Confirmed 0 devices after %s attempts.", max_retries)
-                    return {
-                        "lanDevices": [],
-                        "wlanDevices": [],
-                    }
-            
-            raise ValueError("Parsing failed: Response format has changed or is corrupted.")
+                    _LOGGER.warning(
+                        "Confirmed 0 devices after %s attempts.", max_retries
+                    )
+                    return devices
+
+            raise ValueError(
+                "Parsing failed: Response format has changed or is corrupted."
+            )
+
+    def _parse_devices(self, text: str) -> dict[str, list] | None:
+        """Parse the device tables with the cached firmware profile.
+
+        Other layouts are only tried when the cached profile stops matching,
+        and the layout is detected at most once per response.
+        """
+        failed = get_cached_profile(self.host)
+        if failed is not None:
+            devices = self._parse_with_profile(text, failed)
+            if devices is not None:
+                return devices
+
+            _LOGGER.warning(
+                "Firmware profile '%s' no longer matches, detecting layout again",
+                failed.name,
+            )
+            cache_profile(self.host, None)
+
+        profile = detect_profile(text)
+        if profile is None:
+            _LOGGER.error("No known firmware profile matches the overview response")
+            return None
+        if profile == failed:
+            # Same layout, but its tables are broken; parsing again cannot help
+            _LOGGER.error(
+                "Device tables of firmware profile '%s' cannot be parsed", profile.name
+            )
+            return None
+
+        devices = self._parse_with_profile(text, profile)
+        if devices is not None:
+            _LOGGER.info(
+                "Detected firmware profile '%s' for %s", profile.name, self.host
+            )
+            cache_profile(self.host, profile)
+        return devices
+
+    def _parse_with_profile(
+        self, text: str, profile: FirmwareProfile
+    ) -> dict[str, list] | None:
+        devices = {ROUTER_PROPERTY_LAN_DEVICES: [], ROUTER_PROPERTY_WLAN_DEVICES: []}
+        for var_name, router_property in profile.tables:
+            table = self._safe_extract(text, var_name)
+            if not isinstance(table, list):
+                return None
+            devices[router_property].extend(table)
+        return devices
 
     def _safe_extract(self, data, var_name):
         """Extracts property from response safely"""
@@ -281,9 +591,9 @@ class VodafoneBox:
             if len(parts) < 2:
                 _LOGGER.error("Variable '%s' not found in response", var_name)
                 return None
-            
+
             json_str = parts[1].split(";")[0]
             return json.loads(json_str)
         except (json.JSONDecodeError, IndexError) as e:
             _LOGGER.error("Failed to parse %s: %s", var_name, e)
-            return None
\ No newline at end of file
+            return None
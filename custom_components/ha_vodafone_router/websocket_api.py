@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import VodafoneDeviceView
+
+_LOGGER = logging.getLogger(__name__)
+
+WS_TYPE_DEVICES_SUBSCRIBE = "vodafone_router/devices/subscribe"
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    websocket_api.async_register_command(hass, ws_subscribe_devices)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_DEVICES_SUBSCRIBE,
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def ws_subscribe_devices(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Send the entry's device table once, then only the changes of each poll."""
+    view: VodafoneDeviceView | None = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if not isinstance(view, VodafoneDeviceView):
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded"
+        )
+        return
+
+    coordinator = view.coordinator
+    serial = coordinator.delta_serial
+    options_version = view.options_version
+
+    @callback
+    def _send_snapshot() -> None:
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"],
+                {
+                    "type": "snapshot",
+                    "devices": [
+                        record
+                        for mac, record in coordinator.devices.items()
+                        if view.includes(mac)
+                    ],
+                },
+            )
+        )
+
+    @callback
+    def _forward_delta() -> None:
+        nonlocal serial, options_version
+        if (
+            coordinator.delta_serial == serial
+            and view.options_version == options_version
+        ):
+            # Listener fired without a new fetch, e.g. while serving stale data
+            return
+
+        if (
+            coordinator.delta_serial != serial + 1
+            or view.options_version != options_version
+        ):
+            _send_snapshot()
+        else:
+            delta = coordinator.last_delta
+            joined = [rec for mac, rec in delta.joined.items() if view.includes(mac)]
+            left = [mac for mac in delta.left if view.includes(mac)]
+            changed = [rec for mac, rec in delta.changed.items() if view.includes(mac)]
+            if joined or left or changed:
+                connection.send_message(
+                    websocket_api.event_message(
+                        msg["id"],
+                        {
+                            "type": "delta",
+                            "joined": joined,
+                            "left": left,
+                            "changed": changed,
+                        },
+                    )
+                )
+
+        serial = coordinator.delta_serial
+        options_version = view.options_version
+
+    remove_listener = view.async_add_listener(_forward_delta)
+
+    @callback
+    def _unsubscribe() -> None:
+        remove_listener()
+        untrack()
+
+    @callback
+    def _end() -> None:
+        """Tell the client the entry was unloaded and stop forwarding."""
+        if connection.subscriptions.pop(msg["id"], None) is None:
+            return
+        _unsubscribe()
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], {"type": "end", "reason": "entry_unloaded"}
+            )
+        )
+
+    untrack = view.async_track_subscription(_end)
+    connection.subscriptions[msg["id"]] = _unsubscribe
+    connection.send_result(msg["id"])
+    _send_snapshot()
+    _LOGGER.debug(
+        "Websocket subscription %s to %s devices", msg["id"], view.coordinator.host
+    )
@@ -0,0 +1,98 @@
+"""Measure what importing the integration adds to Home Assistant's startup.
+
+Each module is imported in a fresh interpreter with `-X importtime`, after
+the Home Assistant modules that are always loaded anyway, so the reported
+time is the integration's own cost. Also lists which heavy dependencies the
+import pulled in; the HTTP and crypto stacks should only appear once a
+login happens.
+
+Usage:
+    python scripts/bench_import.py --repeat 5
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "custom_components.ha_vodafone_router"
+
+MODULES = ("", ".config_flow", ".vodafone_box", ".coordinator")
+
+# Imported by Home Assistant before any integration is loaded
+PRELOAD = (
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+)
+
+HEAVY = (
+    "requests",
+    "urllib3",
+    "cryptography",
+    "homeassistant.helpers.update_coordinator",
+    "sqlite3",
+    "cProfile",
+)
+
+_MARK = "-- integration import starts --"
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def measure(module: str) -> tuple[int, list[str]]:
+    """Return the cumulative import time in µs and the heavy modules loaded."""
+    code = (
+        f"import {', '.join(PRELOAD)}; import json, sys; "
+        f"before = set(sys.modules); sys.stderr.write({_MARK!r} + '\\n'); "
+        f"import {module}; "
+        f"print(json.dumps(sorted(set(sys.modules) - before)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Only top-level entries after the preload belong to the integration
+    _, _, output = result.stderr.partition(_MARK)
+    total = 0
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match is not None and not match.group(3):
+            total += int(match.group(2))
+
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    heavy = [name for name in HEAVY if name in loaded]
+    return total, heavy
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for suffix in MODULES:
+        module = PACKAGE + suffix
+        runs = [measure(module) for _ in range(args.repeat)]
+        best = min(total for total, _ in runs)
+        results[module] = {"import_ms": best / 1000, "loads": runs[0][1]}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    for module, result in results.items():
+        loads = ", ".join(result["loads"]) or "-"
+        print(f"{module:<50} {result['import_ms']:>8.1f} ms   loads: {loads}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+"""Compare the per-poll cost of the HTTP and HTTPS transports of VodafoneBox.
+
+Runs against the local fake router with a self-signed certificate, so the
+numbers show the transport overhead alone. Each scenario logs in once and
+then polls the device table:
+
+- http:              plain HTTP with keep-alive
+- https:             pinned HTTPS with keep-alive, one handshake in total
+- https-reconnect:   the router closes every connection, TLS sessions resumed
+- https-full:        the router closes every connection, no resumption
+
+Usage:
+    python scripts/bench_transport.py --polls 500
+"""
+
+import argparse
+import statistics
+import time
+
+from standalone import register_package
+
+register_package()
+
+from custom_components.ha_vodafone_router.vodafone_box import (  # noqa: E402
+    TransportOptions,
+    VodafoneBox,
+)
+from fake_router import FakeRouter  # noqa: E402
+
+SCENARIOS = {
+    "http": (False, True, True),  # https, keep-alive, resume
+    "https": (True, True, True),
+    "https-reconnect": (True, False, True),
+    "https-full": (True, False, False),
+}
+
+
+def run_scenario(name: str, polls: int) -> dict:
+    https, keep_alive, resume = SCENARIOS[name]
+    with FakeRouter(https=https, keep_alive=keep_alive) as router:
+        box = VodafoneBox(
+            router.address,
+            TransportOptions(https=https, fingerprint=router.fingerprint),
+        )
+        try:
+            started = time.perf_counter()
+            box.login("admin", router.password)
+            login = time.perf_counter() - started
+
+            latencies = []
+            for _ in range(polls):
+                if not resume:
+                    box.tls_context.tls_session = None
+                started = time.perf_counter()
+                box.get_connected_devices()
+                latencies.append(time.perf_counter() - started)
+            box.logout()
+        finally:
+            box.close()
+
+        context = box.tls_context
+        return {
+            "scenario": name,
+            "login_ms": login * 1000,
+            "mean_ms": statistics.fmean(latencies) * 1000,
+            "p50_ms": statistics.median(latencies) * 1000,
+            "p95_ms": sorted(latencies)[int(len(latencies) * 0.95)] * 1000,
+            "connections": router.connections,
+            "handshakes": context.handshakes if context else 0,
+            "resumed": context.resumed if context else 0,
+        }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=200)
+    parser.add_argument(
+        "--scenario", choices=SCENARIOS, action="append", help="default: all"
+    )
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'scenario':<16} {'login ms':>9} {'mean ms':>8} {'p50 ms':>7} {'p95 ms':>7}"
+        f" {'conns':>6} {'handshakes':>10} {'resumed':>8}"
+    )
+    for name in args.scenario or SCENARIOS:
+        result = run_scenario(name, args.polls)
+        print(
+            f"{result['scenario']:<16} {result['login_ms']:>9.1f}"
+            f" {result['mean_ms']:>8.2f} {result['p50_ms']:>7.2f}"
+            f" {result['p95_ms']:>7.2f} {result['connections']:>6}"
+            f" {result['handshakes']:>10} {result['resumed']:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
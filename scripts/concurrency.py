@@ -0,0 +1,204 @@
+"""Check VodafoneBox under overlapping calls from many threads.
+
+Worker threads fire device fetches, re-logins and logouts at one shared
+VodafoneBox talking to the local fake router. A barrier releases each round
+at once, so the calls really overlap. The run has two phases:
+
+- fetch:    device fetches and re-logins only, every call must succeed
+- logout:   logouts mixed in; a fetch that finds the session gone logs in
+            again and retries, as the coordinator does
+
+Either phase fails on any other error, and if joining identical in-flight
+calls did not cut the number of requests the router saw.
+
+Usage:
+    python scripts/concurrency.py --threads 16 --rounds 50
+"""
+
+import argparse
+import logging
+import random
+import threading
+import time
+from collections import Counter
+
+from standalone import register_package
+
+register_package()
+
+from custom_components.ha_vodafone_router.const import (  # noqa: E402
+    ROUTER_PROPERTY_LAN_DEVICES,
+    ROUTER_PROPERTY_WLAN_DEVICES,
+)
+from custom_components.ha_vodafone_router.vodafone_box import (  # noqa: E402
+    TransportOptions,
+    VodafoneBox,
+)
+from fake_router import FakeRouter  # noqa: E402
+
+USERNAME = "admin"
+OVERVIEW = "/php/overview_data.php"
+LOGIN = "/php/ajaxSet_Password.php"
+LOGOUT = "/php/logout.php"
+
+# Share of each operation in a phase, the rest are device fetches
+PHASES = {
+    "fetch": {"login": 0.2, "logout": 0.0},
+    "logout": {"login": 0.1, "logout": 0.1},
+}
+
+
+class Worker:
+    """Shared state of the worker threads of one phase."""
+
+    def __init__(self, box: VodafoneBox, router: FakeRouter, args):
+        self.box = box
+        self.router = router
+        self.args = args
+        self.calls: Counter[str] = Counter()  # operation -> calls into the box
+        self.relogins = 0
+        self.errors: list[str] = []
+        self._lock = threading.Lock()
+
+    def _deadline(self) -> float:
+        return time.monotonic() + self.args.deadline
+
+    def _count(self, operation: str) -> None:
+        with self._lock:
+            self.calls[operation] += 1
+
+    def _fetch(self, relogin: bool) -> None:
+        for attempt in range(self.args.retries + 1):
+            self._count("fetch")
+            try:
+                devices = self.box.get_connected_devices(self._deadline())
+            except Exception as err:
+                if not relogin or "Session lost" not in str(err):
+                    raise
+                if attempt == self.args.retries:
+                    raise
+                with self._lock:
+                    self.relogins += 1
+                self._count("login")
+                self.box.login(USERNAME, self.router.password, self._deadline())
+                continue
+
+            if (
+                not devices[ROUTER_PROPERTY_LAN_DEVICES]
+                or not devices[ROUTER_PROPERTY_WLAN_DEVICES]
+            ):
+                raise AssertionError(f"Incomplete device tables: {devices}")
+            return
+
+    def run(self, index: int, barrier: threading.Barrier, shares: dict) -> None:
+        rng = random.Random(self.args.seed + index)
+        relogin = shares["logout"] > 0
+        for _ in range(self.args.rounds):
+            barrier.wait()
+            draw = rng.random()
+            if draw < shares["login"]:
+                operation = "login"
+            elif draw < shares["login"] + shares["logout"]:
+                operation = "logout"
+            else:
+                operation = "fetch"
+
+            try:
+                if operation == "login":
+                    self._count("login")
+                    self.box.login(USERNAME, self.router.password, self._deadline())
+                elif operation == "logout":
+                    self._count("logout")
+                    self.box.logout(self._deadline())
+                else:
+                    self._fetch(relogin)
+            except Exception as err:
+                with self._lock:
+                    self.errors.append(f"{operation}: {type(err).__name__}: {err}")
+
+
+def run_phase(name: str, args) -> list[str]:
+    shares = PHASES[name]
+    with FakeRouter(https=args.https) as router:
+        box = VodafoneBox(
+            router.address,
+            TransportOptions(https=args.https, fingerprint=router.fingerprint),
+        )
+        try:
+            box.login(USERNAME, router.password)
+            baseline = Counter(router.hits)
+
+            worker = Worker(box, router, args)
+            barrier = threading.Barrier(args.threads)
+            threads = [
+                threading.Thread(target=worker.run, args=(i, barrier, shares))
+                for i in range(args.threads)
+            ]
+            started = time.monotonic()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic() - started
+        finally:
+            box.close()
+
+        hits = router.hits - baseline
+
+    sent = {"fetch": hits[OVERVIEW], "login": hits[LOGIN], "logout": hits[LOGOUT]}
+    print(f"phase {name}: {sum(worker.calls.values())} calls in {elapsed:.2f}s")
+    for operation in ("fetch", "login", "logout"):
+        if worker.calls[operation]:
+            print(
+                f"  {operation:<7} {worker.calls[operation]:>5} calls"
+                f"  {sent[operation]:>5} router requests"
+            )
+    if worker.relogins:
+        print(f"  (logins include {worker.relogins} re-logins after a lost session)")
+
+    failures = [f"{name}: {error}" for error in worker.errors[: args.show_errors]]
+    if len(worker.errors) > args.show_errors:
+        failures.append(f"{name}: ... {len(worker.errors)} errors in total")
+    for operation in ("fetch", "login"):
+        if sent[operation] >= worker.calls[operation]:
+            failures.append(
+                f"{name}: {worker.calls[operation]} {operation} calls caused "
+                f"{sent[operation]} router requests, none were joined"
+            )
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument(
+        "--deadline", type=float, default=10.0, help="seconds allowed per call"
+    )
+    parser.add_argument(
+        "--retries", type=int, default=3, help="re-logins per fetch in phase logout"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--https", action="store_true")
+    parser.add_argument("--phase", choices=PHASES, action="append", help="default: all")
+    parser.add_argument("--show-errors", type=int, default=10)
+    args = parser.parse_args(argv)
+    if args.threads < 2:
+        parser.error("--threads must be at least 2 for calls to overlap")
+
+    # Lost sessions are expected in phase logout, failures are reported below
+    logging.basicConfig(level=logging.ERROR)
+
+    failures = []
+    for name in args.phase or PHASES:
+        failures.extend(run_phase(name, args))
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,380 @@
+"""Local stand-in for a Vodafone Station web interface.
+
+Implements just enough of the router to drive VodafoneBox end to end: the
+SJCL login handshake, a single active session guarded by the CSRF nonce, the
+overview device tables and logout. It can serve HTTPS with a freshly
+generated self-signed certificate and can be told to drop sessions or
+connections, which is what the benchmarks and soak tests need.
+
+Usage:
+    python scripts/fake_router.py --https --port 8443
+"""
+
+import argparse
+import binascii
+import datetime
+import hashlib
+import ipaddress
+import json
+import os
+import random
+import secrets
+import socket
+import ssl
+import tempfile
+import threading
+from collections import Counter
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.ciphers.aead import AESCCM
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.x509.oid import NameOID
+
+PBKDF2_ITERATIONS = 1000
+KEY_SIZE_BYTES = 16
+TAG_LENGTH_BYTES = 16
+SESSION_LOST = "PAGE_OVERVIEW_SESSION_LOST_POPUP_TEXT"
+
+
+def _derive_key(password: str, salt_hex: str) -> bytes:
+    return PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=KEY_SIZE_BYTES,
+        salt=binascii.unhexlify(salt_hex),
+        iterations=PBKDF2_ITERATIONS,
+    ).derive(password.encode())
+
+
+def _random_mac() -> str:
+    return ":".join(f"{random.randrange(256):02X}" for _ in range(6))
+
+
+def generate_certificate(directory: str, host: str = "127.0.0.1") -> tuple[str, str]:
+    """Write a self-signed certificate and key for host, return their paths."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, host)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=30))
+        .add_extension(
+            x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address(host))]),
+            critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = os.path.join(directory, "router.crt")
+    key_path = os.path.join(directory, "router.key")
+    with open(cert_path, "wb") as cert_file:
+        cert_file.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as key_file:
+        key_file.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+    return cert_path, key_path
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = 30  # idle keep-alive connections are dropped after this
+
+    server: "_Server"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately, which Nagle would delay
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.router.count_connection()
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        router = self.server.router
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        path = urlsplit(self.path).path
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        session_id = cookie["PHPSESSID"].value if "PHPSESSID" in cookie else None
+
+        status, payload, new_session = router.handle(
+            method, path, body, session_id, self.headers.get("csrfNonce", "")
+        )
+        data = payload.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if new_session:
+            self.send_header("Set-Cookie", f"PHPSESSID={new_session}; path=/")
+        if not router.keep_alive:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    router: "FakeRouter"
+
+
+class FakeRouter:
+    """Threaded fake router bound to a local port."""
+
+    def __init__(
+        self,
+        password: str = "password",
+        https: bool = False,
+        keep_alive: bool = True,
+        lan_devices: int = 5,
+        wlan_devices: int = 10,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.password = password
+        self.https = https
+        self.keep_alive = keep_alive
+        self._host = host
+        self._port = port
+        self._lock = threading.Lock()
+        self.lan_devices = [self._device(i) for i in range(lan_devices)]
+        self.wlan_devices = [self._device(lan_devices + i) for i in range(wlan_devices)]
+        self._offline: list[dict] = []
+
+        # Login state: the router keeps a single active session
+        self._iv: str | None = None
+        self._salt: str | None = None
+        self._pending: str | None = None
+        self._session: str | None = None
+        self._csrf: str | None = None
+
+        self.connections = 0
+        self.requests = 0
+        self.hits: Counter[str] = Counter()  # requests per path
+        self.logins = 0
+        self.fingerprint: str | None = None
+        self._server: _Server | None = None
+        self._thread: threading.Thread | None = None
+        self._tempdir: tempfile.TemporaryDirectory | None = None
+
+    @staticmethod
+    def _device(index: int) -> dict:
+        return {
+            "MAC": _random_mac(),
+            "HostName": f"device-{index}",
+            "IP": f"192.168.0.{index + 10}",
+        }
+
+    @property
+    def address(self) -> str:
+        """host:port to pass to VodafoneBox."""
+        host, port = self._server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self) -> "FakeRouter":
+        self._server = _Server((self._host, self._port), _Handler)
+        self._server.router = self
+        if self.https:
+            self._tempdir = tempfile.TemporaryDirectory()
+            cert_path, key_path = generate_certificate(self._tempdir.name, self._host)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(cert_path, key_path)
+            self._server.socket = context.wrap_socket(
+                self._server.socket, server_side=True
+            )
+            with open(cert_path, "rb") as cert_file:
+                der = ssl.PEM_cert_to_DER_cert(cert_file.read().decode())
+            digest = hashlib.sha256(der).hexdigest()
+            self.fingerprint = ":".join(
+                digest[i : i + 2] for i in range(0, len(digest), 2)
+            )
+
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="FakeRouter", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+            self._tempdir = None
+
+    def __enter__(self) -> "FakeRouter":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def count_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def expire_session(self) -> None:
+        """Invalidate the active session as the router does after idling."""
+        with self._lock:
+            self._session = None
+            self._csrf = None
+
+    def churn(self) -> None:
+        """Let one random device leave or come back.
+
+        Devices move between the tables and an offline pool, so the set of
+        MAC addresses seen over time stays fixed as in a real household.
+        """
+        with self._lock:
+            table = random.choice((self.lan_devices, self.wlan_devices))
+            if self._offline and (not table or random.random() < 0.5):
+                table.append(self._offline.pop(random.randrange(len(self._offline))))
+            elif table:
+                self._offline.append(table.pop(random.randrange(len(table))))
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        body: bytes,
+        session_id: str | None,
+        csrf: str,
+    ) -> tuple[int, str, str | None]:
+        """Return status, body and a new session cookie for one request."""
+        with self._lock:
+            self.requests += 1
+            self.hits[path] += 1
+            if path == "/" and method == "GET":
+                return self._index(session_id)
+            if path == "/php/ajaxSet_Password.php" and method == "POST":
+                return self._login(body, session_id)
+
+            authorized = (
+                self._session is not None
+                and session_id == self._session
+                and csrf == self._csrf
+            )
+            if path == "/php/ajaxSet_Session.php" and method == "POST":
+                return (
+                    200,
+                    json.dumps({"LoginStatus": "yes" if authorized else "no"}),
+                    None,
+                )
+            if path == "/php/overview_data.php" and method == "GET":
+                if not authorized:
+                    return 200, f"<script>alert('{SESSION_LOST}')</script>", None
+                return 200, self._overview(), None
+            if path == "/php/logout.php" and method == "POST":
+                if authorized:
+                    self._session = None
+                    self._csrf = None
+                return 200, "", None
+            return 404, "", None
+
+    def _index(self, session_id: str | None) -> tuple[int, str, str | None]:
+        if self._pending is None or session_id != self._pending:
+            self._pending = secrets.token_hex(16)
+            self._iv = secrets.token_hex(8)
+            self._salt = secrets.token_hex(8)
+        page = (
+            "<html><script>\n"
+            f"var myIv = '{self._iv}';\n"
+            f"var mySalt = '{self._salt}';\n"
+            "</script></html>"
+        )
+        return 200, page, self._pending
+
+    def _login(
+        self, body: bytes, session_id: str | None
+    ) -> tuple[int, str, str | None]:
+        if self._pending is None or session_id != self._pending:
+            return 200, json.dumps({"p_status": "Fail"}), None
+
+        request = json.loads(body)
+        key = _derive_key(self.password, self._salt)
+        ccm = AESCCM(key, tag_length=TAG_LENGTH_BYTES)
+        iv = binascii.unhexlify(self._iv)
+        try:
+            credentials = json.loads(
+                ccm.decrypt(
+                    iv,
+                    binascii.unhexlify(request["EncryptData"]),
+                    request["AuthData"].encode(),
+                )
+            )
+        except Exception:
+            return 200, json.dumps({"p_status": "Fail"}), None
+        if credentials.get("Password") != self.password:
+            return 200, json.dumps({"p_status": "Fail"}), None
+
+        self.logins += 1
+        self._pending = None
+        self._session = secrets.token_hex(16)
+        self._csrf = secrets.token_hex(16)
+        encrypted = ccm.encrypt(iv, self._csrf.encode(), b"nonce")
+        payload = {
+            "p_status": "Match",
+            "encryptData": binascii.hexlify(encrypted).decode(),
+        }
+        return 200, json.dumps(payload), self._session
+
+    def _overview(self) -> str:
+        return (
+            "<script>\n"
+            f"var json_lanAttachedDevice = {json.dumps(self.lan_devices)};\n"
+            f"var json_primaryWlanAttachedDevice = {json.dumps(self.wlan_devices)};\n"
+            "</script>"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--https", action="store_true")
+    parser.add_argument("--no-keep-alive", action="store_true")
+    args = parser.parse_args(argv)
+
+    router = FakeRouter(
+        password=args.password,
+        https=args.https,
+        keep_alive=not args.no_keep_alive,
+        port=args.port,
+    ).start()
+    print(f"Fake router listening on {router.address}")
+    if router.fingerprint:
+        print(f"Certificate fingerprint (SHA-256): {router.fingerprint}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        router.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
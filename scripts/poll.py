@@ -0,0 +1,192 @@
+"""Standalone poller for a Vodafone Station.
+
+Logs in once, polls the connected device table at a fixed interval and writes
+each result to stdout as one JSON object per line. Statistics are printed to
+stderr when the poller stops.
+
+Only the router client of the integration is used, so this runs with just
+requests and cryptography installed, without Home Assistant.
+
+Usage:
+    python scripts/poll.py 192.168.0.1 --deltas
+"""
+
+import argparse
+import getpass
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+from standalone import register_package
+
+register_package()
+
+from custom_components.ha_vodafone_router.const import (  # noqa: E402
+    DEFAULT_SCAN_INTERVAL,
+)
+from custom_components.ha_vodafone_router.devices import (  # noqa: E402
+    diff_devices,
+    index_devices,
+    normalize_devices,
+)
+from custom_components.ha_vodafone_router.vodafone_box import (  # noqa: E402
+    TransportOptions,
+    VodafoneBox,
+)
+
+_LOGGER = logging.getLogger("poll")
+
+PASSWORD_ENV = "VODAFONE_ROUTER_PASSWORD"
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python scripts/poll.py",
+        description="Poll a Vodafone Station and stream device tables as JSON lines.",
+    )
+    parser.add_argument("host", help="Router IP address")
+    parser.add_argument("-u", "--username", default="admin")
+    parser.add_argument(
+        "-p",
+        "--password",
+        default=os.environ.get(PASSWORD_ENV),
+        help=f"Router password (default: ${PASSWORD_ENV}, prompted if unset)",
+    )
+    parser.add_argument("--https", action="store_true", help="Connect over HTTPS")
+    parser.add_argument(
+        "--fingerprint",
+        help="Pin the router certificate to this SHA-256 fingerprint (implies --https)",
+    )
+    parser.add_argument(
+        "--insecure",
+        action="store_true",
+        help="Do not verify the router certificate",
+    )
+    parser.add_argument(
+        "-i",
+        "--interval",
+        type=float,
+        default=DEFAULT_SCAN_INTERVAL,
+        help="Seconds between polls",
+    )
+    parser.add_argument(
+        "-n", "--count", type=int, default=0, help="Stop after N polls (0 = forever)"
+    )
+    parser.add_argument(
+        "--deltas",
+        action="store_true",
+        help="After the first snapshot, only emit joined/left/changed devices",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+def _emit(record):
+    sys.stdout.write(json.dumps(record, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
+def _report(latencies, errors, started):
+    elapsed = time.monotonic() - started
+    polls = len(latencies)
+    lines = [f"polls: {polls}, errors: {errors}, elapsed: {elapsed:.1f}s"]
+    if polls:
+        ordered = sorted(latencies)
+        p95 = ordered[min(polls - 1, int(polls * 0.95))]
+        lines.append(
+            "latency ms: min {:.1f} / mean {:.1f} / p50 {:.1f} / p95 {:.1f} / max {:.1f}".format(
+                ordered[0] * 1000,
+                statistics.fmean(ordered) * 1000,
+                statistics.median(ordered) * 1000,
+                p95 * 1000,
+                ordered[-1] * 1000,
+            )
+        )
+    if elapsed > 0:
+        lines.append(f"throughput: {polls / elapsed:.3f} polls/s")
+    sys.stderr.write("\n".join(lines) + "\n")
+
+
+def _fetch(box, username, password):
+    try:
+        return box.get_connected_devices()
+    except Exception as err:
+        if "Session lost" not in str(err):
+            raise
+        _LOGGER.warning("Session lost, attempting re-authentication ...")
+        box.login(username, password)
+        return box.get_connected_devices()
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        stream=sys.stderr,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    password = args.password or getpass.getpass("Router password: ")
+
+    box = VodafoneBox(
+        args.host,
+        TransportOptions(
+            https=args.https or bool(args.fingerprint),
+            verify_ssl=not args.insecure,
+            fingerprint=args.fingerprint,
+        ),
+    )
+    box.login(args.username, password)
+
+    latencies: list[float] = []
+    errors = 0
+    previous = None
+    started = time.monotonic()
+
+    try:
+        while not args.count or len(latencies) < args.count:
+            cycle_start = time.monotonic()
+            try:
+                data = normalize_devices(_fetch(box, args.username, password))
+            except Exception as err:
+                errors += 1
+                _LOGGER.error("Poll failed: %s", err)
+            else:
+                latencies.append(time.monotonic() - cycle_start)
+                current = index_devices(data)
+                if previous is None or not args.deltas:
+                    _emit({"ts": time.time(), "type": "snapshot", "devices": data})
+                else:
+                    delta = diff_devices(previous, current)
+                    if delta:
+                        _emit(
+                            {
+                                "ts": time.time(),
+                                "type": "delta",
+                                "joined": list(delta.joined.values()),
+                                "left": list(delta.left),
+                                "changed": list(delta.changed.values()),
+                            }
+                        )
+                previous = current
+
+            if args.count and len(latencies) >= args.count:
+                break
+            time.sleep(max(0.0, args.interval - (time.monotonic() - cycle_start)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        try:
+            box.logout()
+        except Exception as err:
+            _LOGGER.warning("Failed to logout from Vodafone Station: %s", err)
+        box.close()
+        _report(latencies, errors, started)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+"""Soak test of the polling coordinator against the local fake router.
+
+Drives the poll cycle through many iterations in which the router keeps
+expiring the session (forcing re-logins) and devices come and go.
+Config-flow style test logins with throw-away VodafoneBox instances are
+mixed in. Traced memory, open sockets and threads are sampled along the way;
+the run fails if any of them grew beyond its bound after warm-up. Poll
+latency percentiles are reported as well.
+
+Two modes are available:
+
+- coordinator:  a real VodafoneDeviceCoordinator, needs Home Assistant
+- box:          the coordinator's cycle without Home Assistant: re-login on a
+                lost session, then normalize, diff, history and presence log
+
+The default is coordinator if Home Assistant is installed, box otherwise.
+
+Usage:
+    python scripts/soak.py --cycles 20000
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from array import array
+
+from standalone import homeassistant_available, register_package
+
+register_package()
+
+from custom_components.ha_vodafone_router.const import (  # noqa: E402
+    DEVICE_PROPERTY_CONNECTION,
+    DEVICE_PROPERTY_IP_ADDRESS,
+)
+from custom_components.ha_vodafone_router.devices import (  # noqa: E402
+    diff_devices,
+    index_devices,
+    normalize_devices,
+)
+from custom_components.ha_vodafone_router.history import (  # noqa: E402
+    ConnectionHistory,
+)
+from custom_components.ha_vodafone_router.presence_log import (  # noqa: E402
+    EVENT_JOIN,
+    EVENT_LEAVE,
+    PresenceLog,
+)
+from custom_components.ha_vodafone_router.vodafone_box import (  # noqa: E402
+    TransportOptions,
+    VodafoneBox,
+)
+from fake_router import FakeRouter  # noqa: E402
+
+ENTRY_ID = "soak"
+USERNAME = "admin"
+MODES = ("coordinator", "box")
+
+
+def _open_sockets() -> int | None:
+    """Return the number of open sockets of this process (Linux only)."""
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return None
+    count = 0
+    for fd in fds:
+        try:
+            if os.readlink(f"/proc/self/fd/{fd}").startswith("socket:"):
+                count += 1
+        except OSError:
+            continue
+    return count
+
+
+def _sample(cycle: int) -> dict:
+    gc.collect()
+    return {
+        "cycle": cycle,
+        "memory": tracemalloc.get_traced_memory()[0],
+        "sockets": _open_sockets(),
+        "threads": threading.active_count(),
+    }
+
+
+def _percentiles(latencies) -> dict:
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98], "max": max(latencies)}
+
+
+def _test_login(router: FakeRouter, transport: TransportOptions) -> None:
+    """What the config and options flows do to validate credentials."""
+    box = VodafoneBox(router.address, transport)
+    try:
+        box.login(USERNAME, router.password)
+    finally:
+        box.close()
+
+
+class BoxPoller:
+    """The coordinator's poll cycle on a plain VodafoneBox."""
+
+    def __init__(self, router: FakeRouter, transport: TransportOptions, path: str):
+        self.router = router
+        self.box = VodafoneBox(router.address, transport)
+        self.devices: dict[str, dict] = {}
+        self.history = ConnectionHistory()
+        self.presence_log = PresenceLog(path)
+        self.polls = 0
+
+    def start(self) -> None:
+        self.box.login(USERNAME, self.router.password)
+        self.presence_log.start()
+
+    def poll(self) -> None:
+        try:
+            data = self.box.get_connected_devices()
+        except Exception as err:
+            if "Session lost" not in str(err):
+                raise
+            self.box.login(USERNAME, self.router.password)
+            data = self.box.get_connected_devices()
+
+        normalize_devices(data)
+        current = index_devices(data)
+        delta = diff_devices(self.devices, current)
+        self.devices = current
+        now = time.time()
+        self.history.apply(delta, now)
+        self.polls += 1
+        if self.polls == 1:
+            return
+        for event, records in ((EVENT_LEAVE, delta.left), (EVENT_JOIN, delta.joined)):
+            for mac, record in records.items():
+                self.presence_log.append(
+                    now,
+                    mac,
+                    event,
+                    record.get(DEVICE_PROPERTY_CONNECTION),
+                    record.get(DEVICE_PROPERTY_IP_ADDRESS),
+                )
+
+    def close(self) -> None:
+        try:
+            self.box.logout(time.monotonic() + 5)
+        finally:
+            self.box.close()
+            self.presence_log.close(5)
+
+
+async def run_cycles(poll, run_job, router, transport, args) -> tuple[list, array]:
+    """Poll args.cycles times, sampling resources and timing every poll."""
+    # Allocated up front so recording latencies does not show up as growth
+    latencies = array("d", bytes(8 * args.cycles))
+    samples = []
+    started = time.monotonic()
+    for cycle in range(1, args.cycles + 1):
+        if cycle % args.expire_every == 0:
+            router.expire_session()
+        if cycle % args.churn_every == 0:
+            router.churn()
+        if cycle % args.flow_every == 0:
+            await run_job(_test_login, router, transport)
+
+        poll_started = time.monotonic()
+        await poll(cycle)
+        latencies[cycle - 1] = time.monotonic() - poll_started
+
+        if cycle % args.sample_every == 0 or cycle == args.cycles:
+            sample = _sample(cycle)
+            samples.append(sample)
+            window = _percentiles(latencies[max(0, cycle - args.sample_every) : cycle])
+            print(
+                f"cycle {cycle:>7}  memory {sample['memory'] / 1024:>9.1f} KiB"
+                f"  sockets {sample['sockets']}  threads {sample['threads']}"
+                f"  poll p95 {window['p95'] * 1000:.2f} ms"
+                f"  ({cycle / (time.monotonic() - started):.0f} cycles/s,"
+                f" {router.logins} logins)",
+                flush=True,
+            )
+    return samples, latencies
+
+
+async def soak_coordinator(router, transport, args) -> tuple[list, array]:
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.ha_vodafone_router.coordinator import (
+        async_acquire_coordinator,
+        async_release_coordinator,
+    )
+
+    hass = HomeAssistant(args.config_dir)
+    try:
+        coordinator = await async_acquire_coordinator(
+            hass,
+            ENTRY_ID,
+            host=router.address,
+            username=USERNAME,
+            password=router.password,
+            transport=transport,
+        )
+
+        async def poll(cycle: int) -> None:
+            await coordinator.async_refresh()
+            if not coordinator.last_update_success:
+                raise RuntimeError(f"Poll {cycle} failed: {coordinator.last_exception}")
+
+        return await run_cycles(
+            poll, hass.async_add_executor_job, router, transport, args
+        )
+    finally:
+        await async_release_coordinator(hass, ENTRY_ID, router.address)
+        await hass.async_stop(force=True)
+
+
+async def soak_box(router, transport, args) -> tuple[list, array]:
+    poller = BoxPoller(router, transport, os.path.join(args.config_dir, "presence.db"))
+    await asyncio.to_thread(poller.start)
+    try:
+
+        async def poll(cycle: int) -> None:
+            await asyncio.to_thread(poller.poll)
+
+        return await run_cycles(poll, asyncio.to_thread, router, transport, args)
+    finally:
+        await asyncio.to_thread(poller.close)
+
+
+async def soak(args) -> tuple[list, array]:
+    router = FakeRouter(
+        https=args.https, lan_devices=args.devices // 3, wlan_devices=args.devices
+    ).start()
+    transport = TransportOptions(https=args.https, fingerprint=router.fingerprint)
+    runner = soak_coordinator if args.mode == "coordinator" else soak_box
+    try:
+        return await runner(router, transport, args)
+    finally:
+        router.stop()
+
+
+def check(samples: list[dict], args) -> list[str]:
+    """Compare the samples after warm-up against the configured bounds."""
+    baseline = next(s for s in samples if s["cycle"] >= args.warmup)
+    bounds = {
+        "memory": args.max_memory_growth * 1024,
+        "sockets": args.max_socket_growth,
+        "threads": args.max_thread_growth,
+    }
+    failures = []
+    for key, bound in bounds.items():
+        if baseline[key] is None:
+            print(f"{key}: not measurable on this platform, skipped")
+            continue
+        peak = max(s[key] for s in samples if s["cycle"] >= baseline["cycle"])
+        growth = peak - baseline[key]
+        print(f"{key}: baseline {baseline[key]}, peak {peak}, growth {growth}")
+        if growth > bound:
+            failures.append(f"{key} grew by {growth}, bound is {bound}")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--mode",
+        choices=MODES,
+        default="coordinator" if homeassistant_available() else "box",
+    )
+    parser.add_argument("--cycles", type=int, default=20_000)
+    parser.add_argument(
+        "--warmup", type=int, default=1_000, help="cycles before the baseline"
+    )
+    parser.add_argument("--sample-every", type=int, default=500)
+    parser.add_argument("--expire-every", type=int, default=7)
+    parser.add_argument("--churn-every", type=int, default=3)
+    parser.add_argument("--flow-every", type=int, default=250)
+    parser.add_argument("--devices", type=int, default=30)
+    parser.add_argument("--https", action="store_true")
+    parser.add_argument("--max-memory-growth", type=int, default=1024, help="KiB")
+    parser.add_argument("--max-socket-growth", type=int, default=2)
+    parser.add_argument("--max-thread-growth", type=int, default=2)
+    args = parser.parse_args(argv)
+    if args.warmup >= args.cycles:
+        parser.error("--warmup must be smaller than --cycles")
+    if args.mode == "coordinator" and not homeassistant_available():
+        parser.error("--mode coordinator needs Home Assistant, use --mode box")
+
+    # Expired sessions are forced on purpose, failures end the run anyway
+    logging.basicConfig(level=logging.ERROR)
+
+    print(f"mode {args.mode}, {'https' if args.https else 'http'}")
+    tracemalloc.start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        args.config_dir = config_dir
+        samples, latencies = asyncio.run(soak(args))
+
+    latency = _percentiles(latencies[args.warmup :])
+    print(
+        "poll latency after warm-up: "
+        + ", ".join(f"{key} {value * 1000:.2f} ms" for key, value in latency.items())
+    )
+    failures = check(samples, args)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,37 @@
+"""Import the integration's router client without Home Assistant.
+
+The package __init__ sets up the Home Assistant integration and needs
+homeassistant installed. VodafoneBox, the device helpers and the other
+modules without Home Assistant imports do not. Registering the packages as
+bare modules pointing at their directories lets the scripts import just
+those modules. Packages that were imported already, e.g. because Home
+Assistant is installed and loaded them, are left alone.
+
+Usage, before importing from the integration:
+    from standalone import register_package
+    register_package()
+"""
+
+import importlib.util
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "custom_components.ha_vodafone_router"
+
+
+def register_package() -> None:
+    """Make the integration's modules importable without running its __init__."""
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    for name in ("custom_components", PACKAGE):
+        if name not in sys.modules:
+            module = types.ModuleType(name)
+            module.__path__ = [os.path.join(ROOT, *name.split("."))]
+            sys.modules[name] = module
+
+
+def homeassistant_available() -> bool:
+    """Return True if the modules that need Home Assistant can be imported."""
+    return importlib.util.find_spec("homeassistant") is not None
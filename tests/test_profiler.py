@@ -0,0 +1,70 @@
+"""Tests for the poll cycle profiler."""
+
+import importlib.util
+import os
+import tracemalloc
+
+import pytest
+
+PROFILER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "custom_components",
+    "ha_vodafone_router",
+    "profiler.py",
+)
+
+
+@pytest.fixture
+def profiler():
+    """Load profiler.py on its own, it only needs the standard library."""
+    spec = importlib.util.spec_from_file_location("profiler", PROFILER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert not tracemalloc.is_tracing()
+    yield module
+    tracemalloc.stop()
+
+
+@pytest.mark.parametrize("first_done", [0, 1])
+def test_overlapping_profilers_finish_in_any_order(profiler, tmp_path, first_done):
+    profilers = [profiler.PollProfiler(1), profiler.PollProfiler(1)]
+    for index, poll_profiler in enumerate(profilers):
+        assert poll_profiler.run(sum, range(100 * (index + 1))) == sum(
+            range(100 * (index + 1))
+        )
+
+    first, second = profilers[first_done], profilers[1 - first_done]
+    snapshot = first.stop()
+    assert snapshot is not None
+    assert tracemalloc.is_tracing()
+    report, dump = first.write_report(snapshot, str(tmp_path / "first"))
+    assert os.path.exists(report) and os.path.exists(dump)
+
+    snapshot = second.stop()
+    assert snapshot is not None
+    assert not tracemalloc.is_tracing()
+    report, dump = second.write_report(snapshot, str(tmp_path / "second"))
+    assert os.path.exists(report) and os.path.exists(dump)
+
+
+def test_stop_is_idempotent(profiler):
+    poll_profiler = profiler.PollProfiler(1)
+    assert poll_profiler.stop() is not None
+    assert poll_profiler.stop() is None
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracing_started_elsewhere_is_left_running(profiler):
+    tracemalloc.start()
+    poll_profiler = profiler.PollProfiler(1)
+    assert poll_profiler.stop() is not None
+    assert tracemalloc.is_tracing()
+
+
+def test_overlapping_capture_is_skipped(profiler):
+    outer, inner = profiler.PollProfiler(1), profiler.PollProfiler(1)
+    assert outer.run(inner.run, len, "abc") == 3
+    assert inner.skipped == 1
+    assert outer.skipped == 0
+    outer.stop()
+    inner.stop()